@@ -0,0 +1,132 @@
+"""Admission control for expensive requests."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; ``retry_after`` is in seconds."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Cap concurrent heavy requests and queue a bounded number of others.
+
+    Admission is awaited on the event loop before the route runs, so queued
+    requests do not hold threadpool workers and cheap routes (point reads)
+    always find one free. Requests beyond ``max_queue`` or waiting longer
+    than ``max_wait`` seconds are rejected with an estimate of when to retry.
+    Meant to be used from a single event loop.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queue: int = 16, max_wait: float = 10.0) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self._max_concurrent = max_concurrent
+        self._max_queue = max_queue
+        self._max_wait = max_wait
+        self._active = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._waits: Deque[float] = deque(maxlen=1024)
+        self._service_time = 0.0
+        self._admitted = 0
+        self._rejected = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one of the concurrent slots for the duration of the block."""
+
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._service_time = elapsed if not self._service_time else 0.8 * self._service_time + 0.2 * elapsed
+            self.release()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot or raise :class:`AdmissionRejected`."""
+
+        if self._active < self._max_concurrent and not self._waiters:
+            self._active += 1
+            self._admit(0.0)
+            return
+        if len(self._waiters) >= self._max_queue:
+            self._rejected += 1
+            raise AdmissionRejected("Too many heavy requests in progress", self.retry_after())
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self._max_wait)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the request gave up.
+                self.release()
+            else:
+                waiter.cancel()
+                self._discard(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._rejected += 1
+                raise AdmissionRejected("Timed out waiting for a heavy request slot", self.retry_after()) from exc
+            raise
+        self._admit(time.perf_counter() - queued_at)
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the oldest waiter if any."""
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def retry_after(self) -> int:
+        """Estimate in whole seconds when a slot is likely to be free."""
+
+        rounds = (len(self._waiters) + 1) / self._max_concurrent
+        return max(1, math.ceil(self._service_time * rounds))
+
+    def metrics(self) -> Dict[str, object]:
+        """Return queue depth, counters and wait-time percentiles in milliseconds."""
+
+        waits = sorted(self._waits)
+
+        def percentile(fraction: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000, 3)
+
+        return {
+            "max_concurrent": self._max_concurrent,
+            "max_queue": self._max_queue,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "wait_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0)},
+            "avg_service_ms": round(self._service_time * 1000, 3),
+        }
+
+    def _admit(self, waited: float) -> None:
+        self._admitted += 1
+        self._waits.append(waited)
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -26,17 +26,79 @@ class BookUpdateDTO(BaseModel):
     pages: int = Field(..., ge=1)
 
 
+class BookLookupRequestDTO(BaseModel):
+    """Request body for resolving many ISBNs in one call."""
+
+    isbns: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+class BookLookupResponseDTO(BaseModel):
+    """Books found for a lookup and the ISBNs that were not."""
+
+    books: list[BookDTO]
+    missing: list[str]
+
+
+class CatalogStatsDTO(BaseModel):
+    """Aggregate catalog counters, optionally grouped."""
+
+    total_books: int = Field(..., ge=0)
+    total_pages: int = Field(..., ge=0)
+    average_pages: float
+    group_by: str | None = None
+    groups: dict[str, int] | None = None
+
+
+class DuplicatePairDTO(BaseModel):
+    """Two books whose normalized title and author are likely the same."""
+
+    isbns: list[str] = Field(..., min_length=2, max_length=2)
+    similarity: float = Field(..., ge=0, le=1)
+
+
+class DuplicatesResponseDTO(BaseModel):
+    """Likely duplicate pairs, most similar first.
+
+    ``truncated`` is set when more pairs than the requested limit qualified;
+    ``skipped_buckets`` counts LSH buckets too large to pair (long series of
+    near-identical titles).
+    """
+
+    threshold: float
+    pairs: list[DuplicatePairDTO]
+    truncated: bool = False
+    skipped_buckets: int = Field(0, ge=0)
+
+
 class ImportRequestDTO(BaseModel):
-    """Request body for catalog import operations."""
+    """Request body for catalog import operations.
 
-    format: Literal["json", "xml"]
+    ``format`` is any name registered in the format factory; unknown names
+    are rejected by the service. Invalid records fail the whole import
+    unless ``skip_invalid`` is set. ``detect_duplicates`` adds likely
+    duplicate pairs among the imported books to the result.
+    """
+
+    format: str = Field(..., min_length=1)
     content: str
+    skip_invalid: bool = False
+    verify_isbn_checksum: bool = False
+    detect_duplicates: bool = False
 
 
 class ExportRequestDTO(BaseModel):
     """Request body for catalog export operations."""
 
-    format: Literal["json", "xml"]
+    format: str = Field(..., min_length=1)
+
+
+class FormatDTO(BaseModel):
+    """Registered format and the capabilities its strategy advertises."""
+
+    name: str
+    streaming: bool
+    binary: bool
+    compression: bool
 
 
 class ExportResponseDTO(BaseModel):
@@ -45,8 +107,44 @@ class ExportResponseDTO(BaseModel):
     content: str
 
 
+class JobDTO(BaseModel):
+    """Status of a background job."""
+
+    id: str
+    kind: str
+    status: str
+    processed: int = Field(..., ge=0)
+    errors: list[str]
+    result: dict[str, Any]
+    created_at: float
+    finished_at: float | None = None
+
+
+class AdmissionMetricsDTO(BaseModel):
+    """State of the heavy-request lane; wait percentiles are in milliseconds."""
+
+    max_concurrent: int = Field(..., ge=1)
+    max_queue: int = Field(..., ge=0)
+    active: int = Field(..., ge=0)
+    queued: int = Field(..., ge=0)
+    admitted: int = Field(..., ge=0)
+    rejected: int = Field(..., ge=0)
+    wait_ms: dict[str, float]
+    avg_service_ms: float
+
+
 class UndoResponseDTO(BaseModel):
-    """Response body containing undo metadata."""
+    """Response body summarising an undo.
 
-    books: list[BookDTO]
+    ``changed_isbns`` is capped by the request ``limit`` (``truncated`` tells
+    whether more changed); ``changed_books`` and ``books`` are only set on
+    request.
+    """
+
+    version: int = Field(..., ge=0)
     remaining_undos: int = Field(..., ge=0)
+    changed_count: int = Field(..., ge=0)
+    changed_isbns: list[str]
+    truncated: bool
+    changed_books: list[BookDTO] | None = None
+    books: list[BookDTO] | None = None
@@ -0,0 +1,101 @@
+"""Response classes used by the API layer."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Optional, Tuple
+
+import anyio
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.types import Receive, Scope, Send
+
+from ..infrastructure.formats import json_engine
+
+
+class FastJSONResponse(JSONResponse):
+    """Compact JSON response rendered by orjson/msgspec when available."""
+
+    def render(self, content: Any) -> bytes:
+        return json_engine.dumps(content)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Return ``None`` when the header is absent, malformed or asks for several
+    ranges (the whole file is served then) and raise :class:`ValueError` when
+    the range cannot be satisfied.
+    """
+
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, sep, end_text = header[len("bytes=") :].strip().partition("-")
+    parts = [part for part in (start_text, end_text) if part]
+    if not sep or not parts or not all(part.isdigit() for part in parts):
+        return None
+    if not start_text:
+        length = int(end_text)
+        if length == 0 or size == 0:
+            raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    if end_text and int(end_text) < start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    end = int(end_text) if end_text else size - 1
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(FileResponse):
+    """File response that honours a single ``Range`` request header.
+
+    Full downloads use :class:`FileResponse`, which hands the path to the
+    server through the ASGI ``pathsend`` extension when available; ranged
+    requests stream only the requested slice so downloads can resume.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], range_header: Optional[str] = None, **kwargs: Any) -> None:
+        super().__init__(path, **kwargs)
+        self.headers["accept-ranges"] = "bytes"
+        self._range_header = range_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        self.stat_result = stat_result
+        self.set_stat_headers(stat_result)
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(self._range_header, size)
+        except ValueError:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            await send({"type": "http.response.start", "status": 416, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if byte_range is None:
+            await super().__call__(scope, receive, send)
+            return
+
+        start, end = byte_range
+        self.status_code = 206
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = end - start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
@@ -2,41 +2,139 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+from typing import AsyncIterator, Callable, Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 
 from ..domain.catalog import Catalog
-from ..domain.services import CatalogService
+from ..domain.duplicates import DEFAULT_THRESHOLD
+from ..domain.jobs import SUCCEEDED, Job, JobManager, JobQueueFull
+from ..domain.services import (
+    DUPLICATE_LIMIT,
+    UNDO_CHANGE_LIMIT,
+    BaseCatalogService,
+    CatalogService,
+    ShardedCatalogService,
+)
+from ..domain.sharded_catalog import ShardedCatalog
 from ..domain.undo_manager import UndoManager
+from ..domain.validation import ImportValidationError
 from ..infrastructure.factories.format_factory import FormatFactory
+from .admission import AdmissionController, AdmissionRejected
 from .dto import (
+    AdmissionMetricsDTO,
     BookDTO,
+    BookLookupRequestDTO,
+    BookLookupResponseDTO,
     BookUpdateDTO,
+    CatalogStatsDTO,
+    DuplicatesResponseDTO,
     ExportRequestDTO,
     ExportResponseDTO,
+    FormatDTO,
     ImportRequestDTO,
+    JobDTO,
     UndoResponseDTO,
 )
+from .responses import FastJSONResponse, RangeFileResponse
 
 router = APIRouter(prefix="/catalog", tags=["catalog"])
 
-_service = CatalogService(Catalog(), UndoManager(), FormatFactory())
+SHARDS_ENV = "BOOK_CATALOG_SHARDS"
+JOB_QUEUE_RETRY_AFTER = 5
+
+
+def create_service(shards: int = 1) -> BaseCatalogService:
+    """Build the catalog service, partitioned when ``shards`` is greater than one."""
+
+    if shards > 1:
+        return ShardedCatalogService(ShardedCatalog(shards), FormatFactory())
+    return CatalogService(Catalog(), UndoManager(), FormatFactory())
 
 
-def get_service() -> CatalogService:
+_service = create_service(int(os.environ.get(SHARDS_ENV, "1")))
+_admission = AdmissionController()
+
+
+def get_service() -> BaseCatalogService:
     """Provide a singleton service instance to the routes."""
 
     return _service
 
 
-@router.get("/books", response_model=list[BookDTO])
-def list_books(service: CatalogService = Depends(get_service)) -> list[BookDTO]:
+def get_jobs(request: Request) -> JobManager:
+    """Provide the background job manager of the running application."""
+
+    return request.app.state.jobs
+
+
+def get_admission() -> AdmissionController:
+    """Provide the controller gating heavy operations."""
+
+    return _admission
+
+
+async def heavy_lane(controller: AdmissionController = Depends(get_admission)) -> AsyncIterator[None]:
+    """Admit a heavy request or reject it with 429 and ``Retry-After``."""
+
+    try:
+        async with controller.slot():
+            yield
+    except AdmissionRejected as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
+def _submit_job(jobs: JobManager, kind: str, work: Callable[[Job], dict]) -> JobDTO:
+    """Queue ``work`` or reject it with 429 when the job queue is full."""
+
+    try:
+        job = jobs.submit(kind, work)
+    except JobQueueFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(JOB_QUEUE_RETRY_AFTER)},
+        ) from exc
+    return JobDTO(**job.to_dict())
+
+
+def _find_job(jobs: JobManager, job_id: str, kind: str) -> Job:
+    """Return the job of the given kind or raise 404."""
+
+    try:
+        job = jobs.get(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    if job.kind != kind:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/books", response_model=list[BookDTO], dependencies=[Depends(heavy_lane)])
+def list_books(service: BaseCatalogService = Depends(get_service)) -> list[BookDTO]:
     """Return all books."""
 
     return [BookDTO(**book) for book in service.list_books()]
 
 
+@router.post("/books:lookup", response_model=BookLookupResponseDTO)
+def lookup_books(payload: BookLookupRequestDTO, service: BaseCatalogService = Depends(get_service)) -> FastJSONResponse:
+    """Return the books for many ISBNs plus the ones that are missing.
+
+    Stored books are already valid, so the result is rendered directly
+    instead of being re-validated through one DTO per book.
+    """
+
+    return FastJSONResponse(service.lookup_books(payload.isbns))
+
+
 @router.get("/books/{isbn}", response_model=BookDTO)
-def get_book(isbn: str, service: CatalogService = Depends(get_service)) -> BookDTO:
+def get_book(isbn: str, service: BaseCatalogService = Depends(get_service)) -> BookDTO:
     """Return a single book or raise 404 when missing."""
 
     try:
@@ -46,7 +144,7 @@ def get_book(isbn: str, service: CatalogService = Depends(get_service)) -> BookD
 
 
 @router.post("/books", response_model=BookDTO, status_code=status.HTTP_201_CREATED)
-def add_book(payload: BookDTO, service: CatalogService = Depends(get_service)) -> BookDTO:
+def add_book(payload: BookDTO, service: BaseCatalogService = Depends(get_service)) -> BookDTO:
     """Insert a book using the facade."""
 
     try:
@@ -60,7 +158,7 @@ def add_book(payload: BookDTO, service: CatalogService = Depends(get_service)) -
 def update_book(
     isbn: str,
     payload: BookUpdateDTO,
-    service: CatalogService = Depends(get_service),
+    service: BaseCatalogService = Depends(get_service),
 ) -> BookDTO:
     """Update a book."""
 
@@ -72,7 +170,7 @@ def update_book(
 
 
 @router.delete("/books/{isbn}", status_code=status.HTTP_200_OK)
-def delete_book(isbn: str, service: CatalogService = Depends(get_service)) -> dict:
+def delete_book(isbn: str, service: BaseCatalogService = Depends(get_service)) -> dict:
     """Remove a book."""
 
     try:
@@ -82,19 +180,77 @@ def delete_book(isbn: str, service: CatalogService = Depends(get_service)) -> di
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
 
-@router.post("/import")
-def import_catalog(payload: ImportRequestDTO, service: CatalogService = Depends(get_service)) -> dict:
+@router.post("/import", dependencies=[Depends(heavy_lane)])
+def import_catalog(payload: ImportRequestDTO, service: BaseCatalogService = Depends(get_service)) -> dict:
     """Import the catalog from a serialized document."""
 
     try:
-        count = service.import_catalog(payload.content, payload.format)
+        return service.import_catalog(
+            payload.content,
+            payload.format,
+            skip_invalid=payload.skip_invalid,
+            verify_isbn_checksum=payload.verify_isbn_checksum,
+            detect_duplicates=payload.detect_duplicates,
+        )
+    except ImportValidationError as exc:
+        detail = {"message": str(exc), **exc.report.to_dict()}
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail) from exc
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return {"count": count}
 
 
-@router.post("/export", response_model=ExportResponseDTO)
-def export_catalog(payload: ExportRequestDTO, service: CatalogService = Depends(get_service)) -> ExportResponseDTO:
+@router.post("/import-jobs", response_model=JobDTO, status_code=status.HTTP_202_ACCEPTED)
+def submit_import_job(
+    payload: ImportRequestDTO,
+    service: BaseCatalogService = Depends(get_service),
+    jobs: JobManager = Depends(get_jobs),
+) -> JobDTO:
+    """Queue an import and return immediately with the job to poll."""
+
+    try:
+        service.validate_format(payload.format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    def run(job: Job) -> dict:
+        try:
+            return service.import_catalog(
+                payload.content,
+                payload.format,
+                progress=job.advance,
+                skip_invalid=payload.skip_invalid,
+                verify_isbn_checksum=payload.verify_isbn_checksum,
+                detect_duplicates=payload.detect_duplicates,
+            )
+        except ImportValidationError as exc:
+            job.errors.extend(
+                f"record {error.index}: {error.field or 'record'} {error.message}" for error in exc.report.errors[:100]
+            )
+            raise
+
+    return _submit_job(jobs, "import", run)
+
+
+@router.get("/import-jobs/{job_id}", response_model=JobDTO)
+def get_import_job(job_id: str, jobs: JobManager = Depends(get_jobs)) -> JobDTO:
+    """Report progress, processed records and errors of an import job."""
+
+    return JobDTO(**_find_job(jobs, job_id, "import").to_dict())
+
+
+@router.delete("/import-jobs/{job_id}", response_model=JobDTO)
+def cancel_import_job(job_id: str, jobs: JobManager = Depends(get_jobs)) -> JobDTO:
+    """Request cancellation; the catalog is left untouched if it succeeds."""
+
+    _find_job(jobs, job_id, "import")
+    try:
+        return JobDTO(**jobs.cancel(job_id).to_dict())
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+
+@router.post("/export", response_model=ExportResponseDTO, dependencies=[Depends(heavy_lane)])
+def export_catalog(payload: ExportRequestDTO, service: BaseCatalogService = Depends(get_service)) -> ExportResponseDTO:
     """Export the catalog to the selected format."""
 
     try:
@@ -104,15 +260,126 @@ def export_catalog(payload: ExportRequestDTO, service: CatalogService = Depends(
     return ExportResponseDTO(content=content)
 
 
-@router.post("/undo", response_model=UndoResponseDTO)
-def undo(service: CatalogService = Depends(get_service)) -> UndoResponseDTO:
-    """Undo the most recent change and expose undo metadata."""
+@router.post("/export-jobs", response_model=JobDTO, status_code=status.HTTP_202_ACCEPTED)
+def submit_export_job(
+    payload: ExportRequestDTO,
+    service: BaseCatalogService = Depends(get_service),
+    jobs: JobManager = Depends(get_jobs),
+) -> JobDTO:
+    """Queue an export to file; unchanged catalog versions reuse the existing file."""
+
+    try:
+        service.validate_format(payload.format)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    def run(job: Job) -> dict:
+        return service.export_to_file(payload.format, progress=job.advance)
+
+    return _submit_job(jobs, "export", run)
+
+
+@router.get("/export-jobs/{job_id}", response_model=JobDTO)
+def get_export_job(job_id: str, jobs: JobManager = Depends(get_jobs)) -> JobDTO:
+    """Report the status of an export job."""
+
+    return JobDTO(**_find_job(jobs, job_id, "export").to_dict())
+
+
+@router.api_route("/export-jobs/{job_id}/download", methods=["GET", "HEAD"], response_class=RangeFileResponse)
+def download_export(
+    job_id: str,
+    range_header: str | None = Header(default=None, alias="Range"),
+    service: BaseCatalogService = Depends(get_service),
+    jobs: JobManager = Depends(get_jobs),
+) -> RangeFileResponse:
+    """Serve the exported file, supporting ``Range`` requests for resumable downloads.
+
+    ``HEAD`` returns the same headers (size, ``Accept-Ranges``) without a body.
+    """
+
+    job = _find_job(jobs, job_id, "export")
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job {job_id} is {job.status}")
+    try:
+        path = service.export_file(str(job.result["file"]))
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc)) from exc
+    return RangeFileResponse(path, range_header=range_header, filename=path.name)
+
+
+@router.get("/stats", response_model=CatalogStatsDTO, response_model_exclude_none=True)
+def catalog_stats(
+    group_by: Literal["publisher", "author", "pages"] | None = None,
+    limit: int | None = Query(default=None, ge=1),
+    service: BaseCatalogService = Depends(get_service),
+) -> CatalogStatsDTO:
+    """Return incrementally maintained totals, optionally grouped."""
+
+    return CatalogStatsDTO(**service.stats(group_by=group_by, limit=limit))
+
+
+@router.get("/duplicates", response_model=DuplicatesResponseDTO, dependencies=[Depends(heavy_lane)])
+def find_duplicates(
+    threshold: float = Query(default=DEFAULT_THRESHOLD, ge=0, le=1),
+    limit: int = Query(default=DUPLICATE_LIMIT, ge=1, le=10 * DUPLICATE_LIMIT),
+    service: BaseCatalogService = Depends(get_service),
+) -> FastJSONResponse:
+    """List likely duplicate books (same work under different ISBNs or spellings).
+
+    Candidates come from an LSH index over normalized title and author;
+    pairs below ``threshold`` estimated similarity are left out and at most
+    ``limit`` pairs are returned, with ``truncated`` set when there were more.
+    """
+
+    return FastJSONResponse(service.duplicates(threshold=threshold, limit=limit))
+
+
+@router.get("/admission", response_model=AdmissionMetricsDTO)
+def admission_metrics(controller: AdmissionController = Depends(get_admission)) -> AdmissionMetricsDTO:
+    """Report queue depth, rejections and wait times of the heavy lane."""
+
+    return AdmissionMetricsDTO(**controller.metrics())
+
+
+@router.get("/formats", response_model=list[FormatDTO])
+def list_formats(service: BaseCatalogService = Depends(get_service)) -> list[FormatDTO]:
+    """List the available import/export formats."""
+
+    return [FormatDTO(**fmt) for fmt in service.list_formats()]
+
+
+@router.post(
+    "/undo",
+    response_model=UndoResponseDTO,
+    response_model_exclude_none=True,
+    dependencies=[Depends(heavy_lane)],
+)
+def undo(
+    include_books: bool = False,
+    include_changed_books: bool = False,
+    limit: int = Query(default=UNDO_CHANGE_LIMIT, ge=1, le=10 * UNDO_CHANGE_LIMIT),
+    service: BaseCatalogService = Depends(get_service),
+) -> UndoResponseDTO:
+    """Undo the most recent change.
+
+    Only the changed ISBNs (up to ``limit``) are returned by default; pass
+    ``include_changed_books`` for their books or ``include_books`` for the
+    full listing.
+    """
 
     try:
-        payload = service.undo()
+        payload = service.undo(include_books=include_books, include_changed_books=include_changed_books, limit=limit)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    changed_books = payload["changed_books"]
+    books = payload["books"]
     return UndoResponseDTO(
-        books=[BookDTO(**book) for book in payload["books"]],
+        version=payload["version"],
         remaining_undos=payload["remaining_undos"],
+        changed_count=payload["changed_count"],
+        changed_isbns=payload["changed_isbns"],
+        truncated=payload["truncated"],
+        changed_books=[BookDTO(**book) for book in changed_books] if changed_books is not None else None,
+        books=[BookDTO(**book) for book in books] if books is not None else None,
     )
@@ -2,17 +2,69 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, MutableMapping, Optional, Tuple
 
 from .book import Book
+from .duplicates import DuplicateIndex
+from .isbn import CatalogKey, catalog_key
+from .lazy_books import BookSource, LazyBookMap
 from .memento import CatalogMemento
+from .stats import CatalogStats
 
 
 class Catalog:
-    """Simple collection acting as the aggregate root of the domain."""
+    """Simple collection acting as the aggregate root of the domain.
+
+    Books are keyed by :func:`catalog_key`, so lookups accept any equivalent
+    spelling of an ISBN (with or without separators, ISBN-10 or ISBN-13)
+    while each book keeps the ISBN it was stored with.
+
+    A catalog loaded with :meth:`load_source` decodes books lazily; the
+    statistics are then built on first use instead of at load time. The
+    duplicate index is built on first use and then maintained; wholesale
+    replacements keep it only when they hand over a matching index, and an
+    undo that changes most books drops it to be rebuilt on demand.
+    """
 
     def __init__(self) -> None:
-        self._books: Dict[str, Book] = {}
+        self._books: MutableMapping[CatalogKey, Book] = {}
+        self._version = 0
+        self._stats: Optional[CatalogStats] = CatalogStats()
+        self._duplicates: Optional[DuplicateIndex] = None
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter incremented on every mutation."""
+
+        return self._version
+
+    @property
+    def stats(self) -> CatalogStats:
+        """Aggregate counters kept up to date by every mutation."""
+
+        if self._stats is None:
+            self._stats = CatalogStats(self._books.values())
+        return self._stats
+
+    @property
+    def duplicates(self) -> DuplicateIndex:
+        """Near-duplicate index kept up to date by every mutation once built."""
+
+        if self._duplicates is None:
+            self._duplicates = DuplicateIndex(self._books.items())
+        return self._duplicates
+
+    @property
+    def tracks_duplicates(self) -> bool:
+        """Whether the duplicate index is currently built and maintained."""
+
+        return self._duplicates is not None
+
+    def adopt_duplicates(self, index: DuplicateIndex, version: int) -> None:
+        """Install ``index`` built from the books at ``version`` unless the catalog changed since."""
+
+        if self._duplicates is None and self._version == version:
+            self._duplicates = index
 
     def list_books(self) -> List[Book]:
         """Return the books as a list preserving insertion order."""
@@ -23,43 +75,126 @@ class Catalog:
         """Return the book or raise :class:`KeyError` when not present."""
 
         try:
-            return self._books[isbn]
+            return self._books[catalog_key(isbn)]
         except KeyError as exc:  # pragma: no cover - defensive
             raise KeyError(f"Book with ISBN {isbn} not found") from exc
 
+    def get_many(self, isbns: Iterable[str]) -> Tuple[List[Book], List[str]]:
+        """Return the stored books and the ISBNs that were not found."""
+
+        found: List[Book] = []
+        missing: List[str] = []
+        for isbn in isbns:
+            book = self._books.get(catalog_key(isbn))
+            if book is None:
+                missing.append(isbn)
+            else:
+                found.append(book)
+        return found, missing
+
     def add_book(self, book: Book) -> None:
         """Insert a new book enforcing ISBN uniqueness."""
 
-        if book.isbn in self._books:
+        key = catalog_key(book.isbn)
+        if key in self._books:
             raise ValueError(f"Book with ISBN {book.isbn} already exists")
-        self._books[book.isbn] = book
+        self._books[key] = book
+        if self._stats is not None:
+            self._stats.add(book)
+        if self._duplicates is not None:
+            self._duplicates.add(key, book)
+        self._version += 1
 
     def update_book(self, isbn: str, book: Book) -> None:
         """Replace the stored book with the provided data."""
 
-        if isbn not in self._books:
+        key = catalog_key(isbn)
+        if key not in self._books:
             raise KeyError(f"Book with ISBN {isbn} not found")
-        self._books[isbn] = book
+        if self._stats is not None:
+            self._stats.remove(self._books[key])
+            self._stats.add(book)
+        if self._duplicates is not None:
+            self._duplicates.add(key, book)
+        self._books[key] = book
+        self._version += 1
 
     def remove_book(self, isbn: str) -> Book:
         """Remove and return the book with the given ISBN."""
 
-        if isbn not in self._books:
+        key = catalog_key(isbn)
+        if key not in self._books:
             raise KeyError(f"Book with ISBN {isbn} not found")
-        return self._books.pop(isbn)
+        removed = self._books.pop(key)
+        if self._stats is not None:
+            self._stats.remove(removed)
+        if self._duplicates is not None:
+            self._duplicates.remove(key)
+        self._version += 1
+        return removed
 
-    def replace_all(self, books: Iterable[Book]) -> None:
-        """Replace the catalog with the provided iterable of books."""
+    def replace_all(self, books: Iterable[Book], duplicates: Optional[DuplicateIndex] = None) -> None:
+        """Replace the catalog with the provided iterable of books.
 
-        self._books = {book.isbn: book for book in books}
+        ``duplicates`` is an index of exactly these books keyed by
+        :func:`catalog_key`; without one the index is rebuilt on demand.
+        """
 
-    def create_memento(self) -> CatalogMemento:
-        """Create a deep copy snapshot for the undo history."""
+        self._books = {catalog_key(book.isbn): book for book in books}
+        self._stats = CatalogStats(self._books.values())
+        self._duplicates = duplicates
+        self._version += 1
+
+    def load_source(self, source: BookSource, positions: Optional[Dict[CatalogKey, int]] = None) -> None:
+        """Serve the catalog from ``source``, decoding books only when accessed.
+
+        ``positions`` restricts the catalog to a subset of the stored records.
+        """
 
-        snapshot = {isbn: Book.from_dict(book.to_dict()) for isbn, book in self._books.items()}
-        return CatalogMemento(snapshot)
+        self._books = LazyBookMap(source, positions)
+        self._stats = None
+        self._duplicates = None
+        self._version += 1
 
-    def restore(self, memento: CatalogMemento) -> None:
-        """Restore the catalog to the state stored in the memento."""
+    def create_memento(self) -> CatalogMemento:
+        """Create a deep copy snapshot for the undo history."""
 
-        self._books = {isbn: Book.from_dict(book.to_dict()) for isbn, book in memento.state.items()}
+        return CatalogMemento(self._copy_books(self._books))
+
+    def restore(self, memento: CatalogMemento) -> List[str]:
+        """Restore the catalog to the memento state and return the changed ISBNs."""
+
+        previous = self._books
+        self._books = self._copy_books(memento.state)
+        self._version += 1
+        keys = None
+        if isinstance(previous, LazyBookMap) and isinstance(self._books, LazyBookMap):
+            keys = self._books.changed_keys(previous)
+        if keys is None:
+            keys = [key for key, book in self._books.items() if previous.get(key) != book]
+            keys.extend(key for key in previous if key not in self._books)
+        # Counters and index are adjusted for the changed books only, so a
+        # lazy catalog does not decode every record after an undo. When most
+        # books changed (undoing an import) the index is rebuilt on demand,
+        # outside the caller's lock, instead of rehashing them here.
+        if self._duplicates is not None and len(keys) * 2 > len(self._books):
+            self._duplicates = None
+        for key in keys:
+            if self._stats is not None:
+                if key in previous:
+                    self._stats.remove(previous[key])
+                if key in self._books:
+                    self._stats.add(self._books[key])
+            if self._duplicates is not None:
+                if key in self._books:
+                    self._duplicates.add(key, self._books[key])
+                else:
+                    self._duplicates.remove(key)
+        return [(self._books[key] if key in self._books else previous[key]).isbn for key in keys]
+
+    @staticmethod
+    def _copy_books(books: MutableMapping[CatalogKey, Book]) -> MutableMapping[CatalogKey, Book]:
+        # Lazy maps share their immutable books instead of decoding every record.
+        if isinstance(books, LazyBookMap):
+            return books.copy()
+        return {key: Book.from_dict(book.to_dict()) for key, book in books.items()}
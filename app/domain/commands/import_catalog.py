@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
 from ..book import Book
 from ..catalog import Catalog
+from ..duplicates import DuplicateIndex
 from .base import Command
 
 
 class ImportCatalogCommand(Command):
     """Swap the entire catalog content and keep a backup for undo."""
 
-    def __init__(self, catalog: Catalog, imported_books: Dict[str, Book]) -> None:
+    def __init__(
+        self,
+        catalog: Catalog,
+        imported_books: Dict[str, Book],
+        duplicates: Optional[DuplicateIndex] = None,
+    ) -> None:
         self._catalog = catalog
         self._imported_books = imported_books
+        self._duplicates = duplicates
         self._previous: Dict[str, Book] | None = None
 
     def execute(self) -> None:
@@ -22,7 +29,7 @@ class ImportCatalogCommand(Command):
             book.isbn: Book.from_dict(book.to_dict())
             for book in self._catalog.list_books()
         }
-        self._catalog.replace_all(self._imported_books.values())
+        self._catalog.replace_all(self._imported_books.values(), self._duplicates)
 
     def undo(self) -> None:
         if self._previous is None:
@@ -0,0 +1,245 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import random
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .book import Book
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.6
+SHINGLE_SIZE = 3
+MAX_BUCKET_SIZE = 50
+
+_SLOT_BITS = 6
+_SLOT_MASK = NUM_PERM - 1
+_EMPTY = -1
+_rng = random.Random(0x15B7)
+# Every empty slot probes the other slots in its own fixed random order, so
+# neighbouring empty slots do not all copy the same donor.
+_DONORS = tuple(tuple(_rng.sample(range(NUM_PERM), NUM_PERM)) for _ in range(NUM_PERM))
+_NON_WORD = re.compile(r"[\W_]+")
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """Case-fold ``text``, strip accents and punctuation and collapse spaces.
+
+    Only combining marks are dropped, so letters of any script are kept.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text)
+    if not decomposed.isascii():
+        decomposed = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", decomposed.casefold()).strip()
+
+
+def signature(book: Book) -> Optional[Signature]:
+    """Return the MinHash signature of the normalized title and author.
+
+    Uses densified one-permutation hashing: each shingle is hashed once and
+    only competes for the minimum of the slot its low bits select, instead
+    of being rehashed for every slot. Empty slots borrow a filled slot
+    picked by a fixed random probe order, so short texts still yield
+    comparable signatures. Texts shorter than a shingle are hashed whole;
+    ``None`` is returned when nothing is left after normalization.
+    """
+
+    text = f"{normalize(book.title)} {normalize(book.author)}".strip()
+    if not text:
+        return None
+    slots = [_EMPTY] * NUM_PERM
+    for start in range(max(1, len(text) - SHINGLE_SIZE + 1)):
+        hashed = _shingle_hash(text[start : start + SHINGLE_SIZE])
+        slot = hashed & _SLOT_MASK
+        value = hashed >> _SLOT_BITS
+        if slots[slot] == _EMPTY or value < slots[slot]:
+            slots[slot] = value
+    if _EMPTY in slots:
+        slots = _densify(slots)
+    return tuple(slots)
+
+
+@lru_cache(maxsize=1 << 16)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+
+
+def _densify(slots: List[int]) -> List[int]:
+    filled = list(slots)
+    for slot, value in enumerate(slots):
+        if value == _EMPTY:
+            filled[slot] = next(slots[donor] for donor in _DONORS[slot] if slots[donor] != _EMPTY)
+    return filled
+
+
+def similarity(first: Signature, second: Signature) -> float:
+    """Estimate the Jaccard similarity of two signatures."""
+
+    return sum(1 for left, right in zip(first, second) if left == right) / NUM_PERM
+
+
+@dataclass(frozen=True)
+class DuplicatePair:
+    """Two books whose title and author are likely the same work."""
+
+    first: str
+    second: str
+    similarity: float
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"isbns": [self.first, self.second], "similarity": round(self.similarity, 3)}
+
+
+def _rank(pair: DuplicatePair) -> Tuple[float, str, str]:
+    return -pair.similarity, pair.first, pair.second
+
+
+@dataclass
+class DuplicateMatches:
+    """Pairs found by :meth:`DuplicateIndex.find` and the buckets it skipped."""
+
+    pairs: List[DuplicatePair] = field(default_factory=list)
+    skipped_buckets: int = 0
+
+
+class DuplicateIndex:
+    """LSH index over book signatures, updated one book at a time.
+
+    Each signature is split into ``BANDS`` bands; books sharing any band
+    land in the same bucket and become candidates, which are then checked
+    against ``threshold``. Adding or removing a book costs one signature,
+    so keeping the index current scales linearly with the catalog instead
+    of comparing every pair of books. Books without letters or digits in
+    their title and author have no signature and are not indexed.
+
+    Buckets holding more than ``MAX_BUCKET_SIZE`` books (a band shared by a
+    whole series of similar titles) are skipped when pairing, so the
+    comparisons stay linear in the catalog size; they are counted in the
+    result instead.
+    """
+
+    def __init__(self, books: Iterable[Tuple[Hashable, Book]] = ()) -> None:
+        self._entries: Dict[Hashable, Tuple[str, Signature]] = {}
+        self._buckets: List[Dict[Signature, Set[Hashable]]] = [{} for _ in range(BANDS)]
+        for key, book in books:
+            self.add(key, book)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def merged(cls, parts: Iterable["DuplicateIndex"]) -> "DuplicateIndex":
+        """Return an index combining several partial ones without rehashing."""
+
+        combined = cls()
+        for part in parts:
+            combined.merge(part)
+        return combined
+
+    def copy(self) -> "DuplicateIndex":
+        """Return an independent index with the same entries."""
+
+        return DuplicateIndex.merged([self])
+
+    def subset(self, keys: Iterable[Hashable]) -> "DuplicateIndex":
+        """Return an index holding only the entries of ``keys`` that are present."""
+
+        part = DuplicateIndex()
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None:
+                part._insert(key, *entry)
+        return part
+
+    def merge(self, other: "DuplicateIndex") -> None:
+        """Add every entry of ``other`` to this index, reusing its signatures."""
+
+        for key, (isbn, sig) in other._entries.items():
+            self.remove(key)
+            self._insert(key, isbn, sig)
+
+    def add(self, key: Hashable, book: Book) -> None:
+        """Index ``book`` under ``key``, replacing any previous entry."""
+
+        self.remove(key)
+        sig = signature(book)
+        if sig is not None:
+            self._insert(key, book.isbn, sig)
+
+    def remove(self, key: Hashable) -> None:
+        """Drop ``key`` from the index if it is present."""
+
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band, bucket_key in enumerate(self._bands(entry[1])):
+            bucket = self._buckets[band][bucket_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band][bucket_key]
+
+    def pairs(self, threshold: float = DEFAULT_THRESHOLD, limit: Optional[int] = None) -> List[DuplicatePair]:
+        """Return candidate pairs at or above ``threshold``, most similar first."""
+
+        return self.find(threshold, limit).pairs
+
+    def find(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        limit: Optional[int] = None,
+        max_bucket: int = MAX_BUCKET_SIZE,
+    ) -> DuplicateMatches:
+        """Return the best pairs at or above ``threshold`` and how many buckets were too large.
+
+        With ``limit`` only the best ``limit`` pairs are kept while scanning.
+        """
+
+        matches = DuplicateMatches()
+        candidates = self._candidates(threshold, max_bucket, matches)
+        if limit is None:
+            matches.pairs = sorted(candidates, key=_rank)
+        else:
+            matches.pairs = heapq.nsmallest(limit, candidates, key=_rank)
+        return matches
+
+    def _candidates(self, threshold: float, max_bucket: int, matches: DuplicateMatches) -> Iterator[DuplicatePair]:
+        seen: Set[Tuple[Hashable, Hashable]] = set()
+        for buckets in self._buckets:
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) > max_bucket:
+                    matches.skipped_buckets += 1
+                    continue
+                ordered = sorted(members, key=str)
+                for position, left in enumerate(ordered):
+                    for right in ordered[position + 1 :]:
+                        if (left, right) in seen:
+                            continue
+                        seen.add((left, right))
+                        left_isbn, left_sig = self._entries[left]
+                        right_isbn, right_sig = self._entries[right]
+                        score = similarity(left_sig, right_sig)
+                        if score >= threshold:
+                            yield DuplicatePair(left_isbn, right_isbn, score)
+
+    def _insert(self, key: Hashable, isbn: str, sig: Signature) -> None:
+        self._entries[key] = (isbn, sig)
+        for band, bucket_key in enumerate(self._bands(sig)):
+            self._buckets[band].setdefault(bucket_key, set()).add(key)
+
+    @staticmethod
+    def _bands(sig: Signature) -> Iterable[Signature]:
+        # Strided bands keep slots that may share a donor in different bands.
+        return (sig[band::BANDS] for band in range(BANDS))
@@ -0,0 +1,66 @@
+"""Helpers for checking and normalizing ISBN-10 and ISBN-13 identifiers."""
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+CatalogKey = Union[int, str]
+
+_SEPARATORS = str.maketrans("", "", "- ")
+
+
+def compact(isbn: str) -> str:
+    """Strip hyphens and spaces and upper-case the ISBN-10 ``X`` check digit."""
+
+    return isbn.translate(_SEPARATORS).upper()
+
+
+def _isbn10_valid(digits: str) -> bool:
+    if not (digits[:9].isdigit() and (digits[9].isdigit() or digits[9] == "X")):
+        return False
+    check = 10 if digits[9] == "X" else int(digits[9])
+    total = sum((10 - position) * int(digit) for position, digit in enumerate(digits[:9])) + check
+    return total % 11 == 0
+
+
+def _isbn13_valid(digits: str) -> bool:
+    if not digits.isdigit():
+        return False
+    total = sum(int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(digits))
+    return total % 10 == 0
+
+
+def is_valid(isbn: str) -> bool:
+    """Return ``True`` for a well-formed ISBN-10 or ISBN-13 with a correct check digit."""
+
+    digits = compact(isbn)
+    if len(digits) == 10:
+        return _isbn10_valid(digits)
+    if len(digits) == 13:
+        return _isbn13_valid(digits)
+    return False
+
+
+def to_isbn13(isbn: str) -> Optional[str]:
+    """Return the ISBN-13 digits for a valid ISBN-10/13, or ``None``."""
+
+    digits = compact(isbn)
+    if len(digits) == 13 and _isbn13_valid(digits):
+        return digits
+    if len(digits) == 10 and _isbn10_valid(digits):
+        body = "978" + digits[:9]
+        total = sum(int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(body))
+        return body + str((10 - total % 10) % 10)
+    return None
+
+
+def catalog_key(isbn: str) -> CatalogKey:
+    """Return the key the catalog stores ``isbn`` under.
+
+    Valid ISBNs map to the integer value of their ISBN-13 form, so every
+    spelling of the same book shares one compact key. Anything else is kept
+    as the original string; such keys never collide with the integers.
+    """
+
+    normalized = to_isbn13(isbn)
+    return int(normalized) if normalized is not None else isbn
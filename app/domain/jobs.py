@@ -0,0 +1,149 @@
+"""Background jobs executed by a bounded worker pool."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested."""
+
+
+class JobQueueFull(Exception):
+    """Raised by :meth:`JobManager.submit` when too many jobs are waiting to start."""
+
+
+@dataclass
+class Job:
+    """Progress and outcome of a single background operation."""
+
+    id: str
+    kind: str
+    status: str = PENDING
+    processed: int = 0
+    errors: List[str] = field(default_factory=list)
+    result: Dict[str, object] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def advance(self, count: int = 1) -> None:
+        """Record processed records and stop the job if it was cancelled."""
+
+        self.processed += count
+        self.raise_if_cancelled()
+
+    def raise_if_cancelled(self) -> None:
+        """Raise :class:`JobCancelled` when cancellation was requested."""
+
+        if self._cancel_requested.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return a serializable view of the job."""
+
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "processed": self.processed,
+            "errors": list(self.errors),
+            "result": dict(self.result),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """Run jobs on a thread pool and keep the most recent ones for polling.
+
+    At most ``max_pending`` jobs wait for a worker; queued jobs hold their
+    whole input, so further submissions are refused instead of buffered.
+    """
+
+    def __init__(self, max_workers: int = 2, retention: int = 100, max_pending: int = 16) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="catalog-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._retention = retention
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, work: Callable[[Job], Dict[str, object]]) -> Job:
+        """Queue ``work`` and return the job tracking it.
+
+        Raises :class:`JobQueueFull` when ``max_pending`` jobs are already waiting.
+        """
+
+        job = Job(id=uuid.uuid4().hex, kind=kind)
+        with self._lock:
+            pending = sum(1 for queued in self._jobs.values() if queued.status == PENDING)
+            if pending >= self._max_pending:
+                raise JobQueueFull(f"{pending} jobs are already waiting; try again later")
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return the job or raise :class:`KeyError` when unknown."""
+
+        with self._lock:
+            try:
+                return self._jobs[job_id]
+            except KeyError as exc:
+                raise KeyError(f"Job {job_id} not found") from exc
+
+    def cancel(self, job_id: str) -> Job:
+        """Request cancellation; raise :class:`ValueError` if the job already finished."""
+
+        job = self.get(job_id)
+        if job.finished:
+            raise ValueError(f"Job {job_id} already {job.status}")
+        job._cancel_requested.set()
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and wait for the running ones."""
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job._cancel_requested.set()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: Job, work: Callable[[Job], Dict[str, object]]) -> None:
+        try:
+            job.raise_if_cancelled()
+            job.status = RUNNING
+            job.result = work(job)
+            status = SUCCEEDED
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as exc:  # noqa: BLE001 - reported through the job
+            job.errors.append(f"{type(exc).__name__}: {exc}")
+            status = FAILED
+        job.finished_at = time.time()
+        job.status = status
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(self._jobs) - self._retention)]:
+            del self._jobs[job_id]
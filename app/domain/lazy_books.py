@@ -0,0 +1,100 @@
+"""Book mapping that materializes entries from a backing source on demand."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, MutableMapping, Optional, Protocol, Set
+
+from .book import Book
+from .isbn import CatalogKey
+
+_NOT_IN_SOURCE = -1
+
+
+class BookSource(Protocol):
+    """Read-only, indexed collection of books such as a mapped snapshot file."""
+
+    def __len__(self) -> int: ...
+
+    def keys(self) -> List[CatalogKey]:
+        """Return the catalog key of every record in storage order."""
+
+    def load(self, position: int) -> Book:
+        """Decode the record stored at ``position``."""
+
+
+class LazyBookMap(MutableMapping[CatalogKey, Book]):
+    """Catalog storage backed by a :class:`BookSource`.
+
+    Only the keys are read up front. A book is decoded the first time it is
+    accessed and cached; writes are kept in memory and shadow the source.
+    Copies share the source and the immutable books, so mementos of a
+    freshly loaded catalog do not force every record to be decoded.
+    """
+
+    def __init__(
+        self,
+        source: BookSource,
+        positions: Optional[Dict[CatalogKey, int]] = None,
+        cache: Optional[Dict[CatalogKey, Book]] = None,
+        overrides: Optional[Set[CatalogKey]] = None,
+    ) -> None:
+        self._source = source
+        if positions is None:
+            positions = dict(zip(source.keys(), range(len(source))))
+        self._positions = positions
+        self._cache = cache if cache is not None else {}
+        self._overrides = overrides if overrides is not None else set()
+
+    @property
+    def materialized(self) -> int:
+        """Number of books currently held in memory."""
+
+        return len(self._cache)
+
+    def __getitem__(self, key: CatalogKey) -> Book:
+        book = self._cache.get(key)
+        if book is None:
+            book = self._source.load(self._positions[key])
+            self._cache[key] = book
+        return book
+
+    def __setitem__(self, key: CatalogKey, book: Book) -> None:
+        self._positions.setdefault(key, _NOT_IN_SOURCE)
+        self._cache[key] = book
+        self._overrides.add(key)
+
+    def __delitem__(self, key: CatalogKey) -> None:
+        del self._positions[key]
+        self._cache.pop(key, None)
+        self._overrides.discard(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[CatalogKey]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def copy(self) -> "LazyBookMap":
+        """Return an independent mapping sharing the source and cached books."""
+
+        return LazyBookMap(self._source, dict(self._positions), dict(self._cache), set(self._overrides))
+
+    def changed_keys(self, other: "LazyBookMap") -> Optional[List[CatalogKey]]:
+        """Return keys whose books differ from ``other``.
+
+        Only entries written since loading are compared, so untouched records
+        stay on disk. Returns ``None`` when ``other`` uses a different source.
+        """
+
+        if other._source is not self._source:
+            return None
+        candidates = self._overrides | other._overrides
+        candidates.update(self._positions.keys() ^ other._positions.keys())
+        changed = []
+        for key in sorted(candidates, key=str):
+            if key not in self or key not in other or self[key] != other[key]:
+                changed.append(key)
+        return changed
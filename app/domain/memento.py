@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import MutableMapping
 
 from .book import Book
+from .isbn import CatalogKey
 
 
 @dataclass(frozen=True)
 class CatalogMemento:
     """Stores a deep copy of the catalog state for undo operations."""
 
-    state: Dict[str, Book]
+    state: MutableMapping[CatalogKey, Book]
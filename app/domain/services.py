@@ -2,82 +2,479 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
 
 from .book import Book
 from .catalog import Catalog
 from .commands.add_book import AddBookCommand
+from .commands.base import Command
 from .commands.import_catalog import ImportCatalogCommand
 from .commands.remove_book import RemoveBookCommand
 from .commands.update_book import UpdateBookCommand
+from .duplicates import DEFAULT_THRESHOLD, DuplicateIndex
+from .isbn import CatalogKey, catalog_key
+from .sharded_catalog import ShardedCatalog
 from .undo_manager import UndoManager
+from .validation import ImportValidationError, ImportValidator, ValidationReport
+from ..infrastructure.export_store import ExportStore
 from ..infrastructure.factories.format_factory import FormatFactory
+from ..infrastructure.formats.base import CatalogFormatStrategy, iter_lines
+from ..infrastructure.snapshot import MappedSnapshot, write_snapshot
 
+UNDO_CHANGE_LIMIT = 1000
+DUPLICATE_LIMIT = 100
 
-class CatalogService:
-    """High-level operations used by FastAPI routes."""
 
-    def __init__(self, catalog: Catalog, undo_manager: UndoManager, format_factory: FormatFactory) -> None:
-        self._catalog = catalog
-        self._undo_manager = undo_manager
-        self._format_factory = format_factory
+class BaseCatalogService(ABC):
+    """High-level operations used by FastAPI routes.
 
-    def list_books(self) -> List[Dict[str, str | int]]:
-        """Return all books as serializable dictionaries."""
+    Parsing, validation, export and snapshot handling are shared; subclasses
+    provide the storage backend and its locking. Routes run on a thread
+    pool, so backends guard every access to the catalog while parsing and
+    serialization happen outside the locks where possible.
+    """
+
+    def __init__(self, format_factory: FormatFactory, export_store: Optional[ExportStore] = None) -> None:
+        self._format_factory = format_factory
+        self._export_store = export_store or ExportStore()
 
-        return [book.to_dict() for book in self._catalog.list_books()]
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Current catalog version."""
 
+    @abstractmethod
     def get_book(self, isbn: str) -> Dict[str, str | int]:
         """Retrieve a book by ISBN."""
 
-        return self._catalog.get_book(isbn).to_dict()
+    @abstractmethod
+    def stats(self, group_by: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, object]:
+        """Return aggregate counters without scanning the catalog."""
 
+    @abstractmethod
     def add_book(self, payload: Dict[str, str | int]) -> Dict[str, str | int]:
         """Add a book using the command interface."""
 
-        self._undo_manager.record_state(self._catalog.create_memento())
-        command = AddBookCommand(self._catalog, Book.from_dict(payload))
-        command.execute()
-        return self.get_book(payload["isbn"])  # type: ignore[index]
-
+    @abstractmethod
     def update_book(self, isbn: str, payload: Dict[str, str | int]) -> Dict[str, str | int]:
-        """Update a book via the command interface."""
+        """Update a book via the command interface.
 
-        self._undo_manager.record_state(self._catalog.create_memento())
-        updated = Book.from_dict({**payload, "isbn": isbn})
-        command = UpdateBookCommand(self._catalog, isbn, updated)
-        command.execute()
-        return self.get_book(isbn)
+        ``isbn`` may be any equivalent spelling; the book keeps the ISBN it
+        was stored with.
+        """
 
+    @abstractmethod
     def remove_book(self, isbn: str) -> None:
         """Remove a book via the command interface."""
 
-        self._undo_manager.record_state(self._catalog.create_memento())
-        command = RemoveBookCommand(self._catalog, isbn)
-        command.execute()
+    @abstractmethod
+    def load_snapshot(self, path: str | Path) -> int:
+        """Serve the catalog from a snapshot file without decoding it up front.
+
+        Loading is not recorded in the undo history.
+        """
+
+    @abstractmethod
+    def _exclusive(self) -> ContextManager[object]:
+        """Hold every lock of the backend, re-entrantly."""
+
+    @abstractmethod
+    def _read_books(self) -> Tuple[List[Book], int]:
+        """Return a consistent view of every book and the matching version."""
+
+    @abstractmethod
+    def _get_many(self, isbns: List[str]) -> Tuple[List[Book], List[str]]:
+        """Return the stored books in request order and the ISBNs not found."""
+
+    @abstractmethod
+    def _swap_books(self, books: Dict[str, Book], duplicates: Optional[DuplicateIndex] = None) -> None:
+        """Replace the whole catalog as one undoable operation.
+
+        ``duplicates`` indexes exactly ``books`` by catalog key, if given.
+        """
+
+    @abstractmethod
+    def _duplicate_index(self) -> DuplicateIndex:
+        """Return a private index over every book, safe to read without locks."""
+
+    @abstractmethod
+    def _undo(self) -> Tuple[List[str], int, int]:
+        """Revert the latest operation under :meth:`_exclusive`.
+
+        Returns the changed ISBNs, the new version and the remaining undos.
+        """
+
+    def list_books(self) -> List[Dict[str, str | int]]:
+        """Return all books as serializable dictionaries."""
+
+        books, _ = self._read_books()
+        return [book.to_dict() for book in books]
 
-    def import_catalog(self, content: str, fmt: str) -> int:
-        """Import books using the strategy selected by the factory."""
+    def duplicates(self, threshold: float = DEFAULT_THRESHOLD, limit: int = DUPLICATE_LIMIT) -> Dict[str, object]:
+        """Return the ``limit`` most likely duplicate pairs, compared without holding locks.
+
+        ``truncated`` tells whether more pairs qualified and
+        ``skipped_buckets`` how many oversized LSH buckets were not paired.
+        """
+
+        return {"threshold": threshold, **_duplicate_summary(self._duplicate_index(), threshold, limit)}
+
+    def lookup_books(self, isbns: List[str]) -> Dict[str, list]:
+        """Resolve many ISBNs, locking the storage once.
+
+        Duplicate ISBNs, including equivalent spellings of the same one, are
+        resolved once under their first spelling; the response keeps
+        request order.
+        """
+
+        unique: Dict[CatalogKey, str] = {}
+        for isbn in isbns:
+            unique.setdefault(catalog_key(isbn), isbn)
+        found, missing = self._get_many(list(unique.values()))
+        return {"books": [book.to_dict() for book in found], "missing": missing}
+
+    def validate_format(self, fmt: str) -> None:
+        """Raise :class:`ValueError` when ``fmt`` is not registered."""
+
+        self._format_factory.create(fmt)
+
+    def import_catalog(
+        self,
+        content: str,
+        fmt: str,
+        progress: Optional[Callable[[int], None]] = None,
+        skip_invalid: bool = False,
+        verify_isbn_checksum: bool = False,
+        detect_duplicates: bool = False,
+    ) -> Dict[str, object]:
+        """Import books using the strategy selected by the factory.
+
+        Every record is validated before the catalog is touched. Invalid
+        records raise :class:`ImportValidationError` with the full report,
+        or are left out when ``skip_invalid`` is set; an undecodable line of
+        a line format counts as an invalid record, while a malformed JSON or
+        XML document raises :class:`ValueError`. Parsing runs without
+        the lock and the catalog swap happens atomically at the end.
+        ``progress`` receives counts of processed records and may raise to
+        abort; streaming formats report every record as it is read, the
+        others parse with their typed decoder and report during validation.
+        With ``detect_duplicates`` the result also lists likely duplicate
+        pairs among the imported books, at most ``DUPLICATE_LIMIT`` of them;
+        they are flagged, not dropped, and
+        the index built for them is handed to the catalog. Without it the
+        catalog drops its index and rebuilds it on the next duplicates query.
+        """
 
         strategy = self._format_factory.create(fmt)
-        data = strategy.deserialize(content)
-        books = {entry["isbn"]: Book.from_dict(entry) for entry in data}
-        self._undo_manager.record_state(self._catalog.create_memento())
-        command = ImportCatalogCommand(self._catalog, books)
-        command.execute()
-        return len(books)
+        validator = ImportValidator(verify_isbn_checksum=verify_isbn_checksum)
+        report = self._parse_import(strategy, content, validator, progress)
+        if not report.valid and not skip_invalid:
+            raise ImportValidationError(report)
+        books = {book.isbn: book for book in report.books}
+        result: Dict[str, object] = {
+            "count": len(books),
+            "skipped": report.invalid_count,
+            "errors": report.to_dict()["errors"],
+        }
+        index = None
+        if detect_duplicates:
+            index = DuplicateIndex((catalog_key(book.isbn), book) for book in books.values())
+            summary = _duplicate_summary(index, DEFAULT_THRESHOLD, DUPLICATE_LIMIT)
+            result["duplicates"] = summary["pairs"]
+            result["duplicates_truncated"] = summary["truncated"]
+            result["duplicates_skipped_buckets"] = summary["skipped_buckets"]
+        self._swap_books(books, index)
+        return result
+
+    @staticmethod
+    def _parse_import(
+        strategy: CatalogFormatStrategy,
+        content: str,
+        validator: ImportValidator,
+        progress: Optional[Callable[[int], None]],
+    ) -> ValidationReport:
+        if strategy.capabilities.streaming:
+            # Line formats decode records independently, so a malformed line
+            # becomes an error at its index instead of failing the import.
+            records = []
+            for entry in strategy.iter_deserialize(iter_lines(content), lenient=True):
+                records.append(entry)
+                if progress is not None:
+                    progress(1)
+            return validator.validate(records)
+        try:
+            books = strategy.deserialize_books(content)
+        except (KeyError, TypeError, ValueError):
+            # Typed decoding stops at the first bad record; re-parse
+            # loosely so the report covers every record.
+            return validator.validate(strategy.deserialize(content), progress)
+        return validator.validate_books(books, progress)
 
     def export_catalog(self, fmt: str) -> str:
         """Export the current catalog using the chosen strategy."""
 
         strategy = self._format_factory.create(fmt)
-        return strategy.serialize(self.list_books())
+        books, _ = self._read_books()
+        return strategy.serialize([book.to_dict() for book in books])
+
+    def export_to_file(
+        self,
+        fmt: str,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, object]:
+        """Write the current catalog version to the export store.
+
+        The file is reused when this version was already exported in ``fmt``,
+        so repeated exports of an unchanged catalog cost no serialization.
+        """
+
+        strategy = self._format_factory.create(fmt)
+        books, version = self._read_books()
+
+        def records() -> Iterator[Dict[str, str | int]]:
+            for book in books:
+                yield book.to_dict()
+                if progress is not None:
+                    progress(1)
+
+        path = self._export_store.write(fmt, version, strategy.iter_serialize(records()))
+        return {"format": fmt.lower(), "version": version, "file": path.name, "size": path.stat().st_size}
+
+    def export_file(self, name: str) -> Path:
+        """Return the path of a previously written export."""
+
+        return self._export_store.resolve(name)
+
+    def save_snapshot(self, path: str | Path) -> int:
+        """Write the catalog to a memory-mappable snapshot file."""
+
+        books, _ = self._read_books()
+        return write_snapshot(path, books)
+
+    def list_formats(self) -> List[Dict[str, object]]:
+        """Describe the registered formats and their capabilities."""
+
+        return [
+            {"name": fmt, **asdict(self._format_factory.capabilities(fmt))}
+            for fmt in self._format_factory.formats()
+        ]
 
-    def undo(self) -> Dict[str, object]:
-        """Undo the latest operation and return metadata for the response."""
+    def undo(
+        self,
+        include_books: bool = False,
+        include_changed_books: bool = False,
+        limit: int = UNDO_CHANGE_LIMIT,
+    ) -> Dict[str, object]:
+        """Undo the latest operation and return a summary of what changed.
 
-        self._undo_manager.undo(self._catalog)
+        At most ``limit`` changed ISBNs are listed, with ``truncated`` set
+        when there were more. Their books are only resolved when
+        ``include_changed_books`` is set, and the full listing only when
+        ``include_books`` is set.
+        """
+
+        with self._exclusive():
+            changed, version, remaining = self._undo()
+            listed = changed[:limit]
+            found = self._get_many(listed)[0] if include_changed_books else None
+            books = self.list_books() if include_books else None
         return {
-            "books": self.list_books(),
-            "remaining_undos": self._undo_manager.remaining(),
+            "version": version,
+            "remaining_undos": remaining,
+            "changed_count": len(changed),
+            "changed_isbns": listed,
+            "truncated": len(listed) < len(changed),
+            "changed_books": [book.to_dict() for book in found] if found is not None else None,
+            "books": books,
         }
+
+
+class CatalogService(BaseCatalogService):
+    """Service over a single :class:`Catalog` guarded by one lock."""
+
+    def __init__(
+        self,
+        catalog: Catalog,
+        undo_manager: UndoManager,
+        format_factory: FormatFactory,
+        export_store: Optional[ExportStore] = None,
+    ) -> None:
+        super().__init__(format_factory, export_store)
+        self._catalog = catalog
+        self._undo_manager = undo_manager
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._catalog.version
+
+    def get_book(self, isbn: str) -> Dict[str, str | int]:
+        with self._lock:
+            return self._catalog.get_book(isbn).to_dict()
+
+    def stats(self, group_by: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, object]:
+        with self._lock:
+            return self._catalog.stats.to_dict(group_by=group_by, limit=limit)
+
+    def add_book(self, payload: Dict[str, str | int]) -> Dict[str, str | int]:
+        with self._lock:
+            self._execute(AddBookCommand(self._catalog, Book.from_dict(payload)))
+            return self.get_book(payload["isbn"])  # type: ignore[index]
+
+    def update_book(self, isbn: str, payload: Dict[str, str | int]) -> Dict[str, str | int]:
+        with self._lock:
+            updated = Book.from_dict({**payload, "isbn": self._catalog.get_book(isbn).isbn})
+            self._execute(UpdateBookCommand(self._catalog, isbn, updated))
+            return self.get_book(isbn)
+
+    def remove_book(self, isbn: str) -> None:
+        with self._lock:
+            self._execute(RemoveBookCommand(self._catalog, isbn))
+
+    def load_snapshot(self, path: str | Path) -> int:
+        snapshot = MappedSnapshot(path)
+        with self._lock:
+            self._catalog.load_source(snapshot)
+        return len(snapshot)
+
+    def _exclusive(self) -> ContextManager[object]:
+        return self._lock
+
+    def _read_books(self) -> Tuple[List[Book], int]:
+        with self._lock:
+            return self._catalog.list_books(), self._catalog.version
+
+    def _get_many(self, isbns: List[str]) -> Tuple[List[Book], List[str]]:
+        with self._lock:
+            return self._catalog.get_many(isbns)
+
+    def _swap_books(self, books: Dict[str, Book], duplicates: Optional[DuplicateIndex] = None) -> None:
+        with self._lock:
+            self._execute(ImportCatalogCommand(self._catalog, books, duplicates))
+
+    def _duplicate_index(self) -> DuplicateIndex:
+        with self._lock:
+            if self._catalog.tracks_duplicates:
+                return self._catalog.duplicates.copy()
+            books, version = self._catalog.list_books(), self._catalog.version
+        index = DuplicateIndex((catalog_key(book.isbn), book) for book in books)
+        adopted = index.copy()
+        with self._lock:
+            self._catalog.adopt_duplicates(adopted, version)
+        return index
+
+    def _execute(self, command: Command) -> None:
+        # Like ShardedCatalog.execute: a failed command leaves no undo state.
+        memento = self._catalog.create_memento()
+        command.execute()
+        self._undo_manager.record_state(memento)
+
+    def _undo(self) -> Tuple[List[str], int, int]:
+        changed = self._undo_manager.undo(self._catalog)
+        return changed, self._catalog.version, self._undo_manager.remaining()
+
+
+class ShardedCatalogService(BaseCatalogService):
+    """Service over a :class:`ShardedCatalog` with one lock per shard.
+
+    Single-book reads and writes lock only the shard owning the ISBN, so
+    concurrent writers to different books do not wait for each other.
+    Imports, exports, full listings and undo lock every shard. Listings are
+    ordered shard by shard rather than by insertion.
+    """
+
+    def __init__(
+        self,
+        catalog: ShardedCatalog,
+        format_factory: FormatFactory,
+        export_store: Optional[ExportStore] = None,
+    ) -> None:
+        super().__init__(format_factory, export_store)
+        self._sharded = catalog
+
+    @property
+    def version(self) -> int:
+        with self._sharded.locked():
+            return self._sharded.version
+
+    def get_book(self, isbn: str) -> Dict[str, str | int]:
+        shard = self._sharded.shard_for(isbn)
+        with shard.lock:
+            return shard.catalog.get_book(isbn).to_dict()
+
+    def stats(self, group_by: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, object]:
+        with self._sharded.locked():
+            merged = self._sharded.stats()
+        return merged.to_dict(group_by=group_by, limit=limit)
+
+    def add_book(self, payload: Dict[str, str | int]) -> Dict[str, str | int]:
+        book = Book.from_dict(payload)
+        index = self._sharded.index_for(book.isbn)
+        shard = self._sharded.shards[index]
+        with shard.lock:
+            self._sharded.execute(index, AddBookCommand(shard.catalog, book))
+            return shard.catalog.get_book(book.isbn).to_dict()
+
+    def update_book(self, isbn: str, payload: Dict[str, str | int]) -> Dict[str, str | int]:
+        index = self._sharded.index_for(isbn)
+        shard = self._sharded.shards[index]
+        with shard.lock:
+            updated = Book.from_dict({**payload, "isbn": shard.catalog.get_book(isbn).isbn})
+            self._sharded.execute(index, UpdateBookCommand(shard.catalog, isbn, updated))
+            return shard.catalog.get_book(isbn).to_dict()
+
+    def remove_book(self, isbn: str) -> None:
+        index = self._sharded.index_for(isbn)
+        shard = self._sharded.shards[index]
+        with shard.lock:
+            self._sharded.execute(index, RemoveBookCommand(shard.catalog, isbn))
+
+    def load_snapshot(self, path: str | Path) -> int:
+        snapshot = MappedSnapshot(path)
+        with self._sharded.locked():
+            self._sharded.load_source(snapshot)
+        return len(snapshot)
+
+    def _exclusive(self) -> ContextManager[object]:
+        return self._sharded.locked()
+
+    def _read_books(self) -> Tuple[List[Book], int]:
+        with self._sharded.locked():
+            return self._sharded.list_books(), self._sharded.version
+
+    def _get_many(self, isbns: List[str]) -> Tuple[List[Book], List[str]]:
+        return self._sharded.get_many(isbns)
+
+    def _swap_books(self, books: Dict[str, Book], duplicates: Optional[DuplicateIndex] = None) -> None:
+        parts = self._sharded.partition(books.values())
+        indexes = [
+            duplicates.subset(catalog_key(book.isbn) for book in part) if duplicates is not None else None
+            for part in parts
+        ]
+        with self._sharded.locked():
+            commands = [
+                ImportCatalogCommand(shard.catalog, {book.isbn: book for book in part}, index)
+                for shard, part, index in zip(self._sharded.shards, parts, indexes)
+            ]
+            self._sharded.execute_all(commands)
+
+    def _duplicate_index(self) -> DuplicateIndex:
+        return self._sharded.duplicates()
+
+    def _undo(self) -> Tuple[List[str], int, int]:
+        changed = self._sharded.undo()
+        return changed, self._sharded.version, self._sharded.remaining_undos()
+
+
+def _duplicate_summary(index: DuplicateIndex, threshold: float, limit: int) -> Dict[str, object]:
+    matches = index.find(threshold, limit + 1)
+    return {
+        "pairs": [pair.to_dict() for pair in matches.pairs[:limit]],
+        "truncated": len(matches.pairs) > limit,
+        "skipped_buckets": matches.skipped_buckets,
+    }
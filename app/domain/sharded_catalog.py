@@ -0,0 +1,196 @@
+"""Catalog partitioned by ISBN into independently locked shards."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .book import Book
+from .catalog import Catalog
+from .duplicates import DuplicateIndex
+from .commands.base import Command
+from .isbn import CatalogKey, catalog_key
+from .lazy_books import BookSource
+from .stats import CatalogStats
+from .undo_manager import UndoManager
+
+
+@dataclass
+class CatalogShard:
+    """One partition: its books, its undo history and the lock guarding both."""
+
+    catalog: Catalog = field(default_factory=Catalog)
+    undo_manager: UndoManager = field(default_factory=UndoManager)
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+class ShardedCatalog:
+    """Books spread over ``shards`` catalogs by the hash of their catalog key.
+
+    Writers lock only the shard owning the ISBN, so edits to different
+    books proceed in parallel. Operations spanning the whole catalog lock
+    every shard in index order, which keeps them atomic and deadlock free.
+    A journal of the shards touched by each operation lets undo revert the
+    latest change across shards in the order the changes were made.
+    """
+
+    def __init__(self, shards: int = 8, undo_limit: int = 10) -> None:
+        if shards < 1:
+            raise ValueError("A sharded catalog needs at least one shard")
+        self.shards = [CatalogShard(Catalog(), UndoManager(undo_limit)) for _ in range(shards)]
+        self._journal: Deque[Tuple[int, ...]] = deque(maxlen=undo_limit)
+        self._journal_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Sum of the shard versions; grows with every mutation."""
+
+        return sum(shard.catalog.version for shard in self.shards)
+
+    def index_for(self, isbn: str) -> int:
+        """Return the index of the shard owning ``isbn``."""
+
+        return self._index_for_key(catalog_key(isbn))
+
+    def shard_for(self, isbn: str) -> CatalogShard:
+        """Return the shard owning ``isbn``."""
+
+        return self.shards[self.index_for(isbn)]
+
+    def partition(self, books: Iterable[Book]) -> List[List[Book]]:
+        """Split ``books`` into one list per shard, keeping their order."""
+
+        parts: List[List[Book]] = [[] for _ in self.shards]
+        for book in books:
+            parts[self.index_for(book.isbn)].append(book)
+        return parts
+
+    @contextmanager
+    def locked(self, indexes: Optional[Sequence[int]] = None) -> Iterator[None]:
+        """Hold the locks of ``indexes`` (every shard by default) in index order."""
+
+        with ExitStack() as stack:
+            for index in sorted(set(range(len(self.shards)) if indexes is None else indexes)):
+                stack.enter_context(self.shards[index].lock)
+            yield
+
+    def execute(self, index: int, command: Command) -> None:
+        """Run ``command`` on a shard and record it for undo once it succeeds.
+
+        The caller must hold the shard lock.
+        """
+
+        shard = self.shards[index]
+        memento = shard.catalog.create_memento()
+        command.execute()
+        shard.undo_manager.record_state(memento)
+        self._record((index,))
+
+    def execute_all(self, commands: Sequence[Command]) -> None:
+        """Run one command per shard as a single undoable operation.
+
+        The caller must hold every shard lock.
+        """
+
+        mementos = [shard.catalog.create_memento() for shard in self.shards]
+        for command in commands:
+            command.execute()
+        for shard, memento in zip(self.shards, mementos):
+            shard.undo_manager.record_state(memento)
+        self._record(tuple(range(len(self.shards))))
+
+    def undo(self) -> List[str]:
+        """Revert the latest operation and return the changed ISBNs.
+
+        The caller must hold every shard lock.
+        """
+
+        with self._journal_lock:
+            if not self._journal:
+                raise ValueError("No states available to undo")
+            indexes = self._journal.pop()
+        changed: List[str] = []
+        for index in indexes:
+            shard = self.shards[index]
+            changed.extend(shard.undo_manager.undo(shard.catalog))
+        return changed
+
+    def remaining_undos(self) -> int:
+        """Return how many operations can still be undone."""
+
+        with self._journal_lock:
+            return len(self._journal)
+
+    def get_many(self, isbns: Sequence[str]) -> Tuple[List[Book], List[str]]:
+        """Return the stored books in request order and the ISBNs not found.
+
+        Each shard involved is locked once while its ISBNs are resolved.
+        """
+
+        groups: Dict[int, List[str]] = {}
+        for isbn in isbns:
+            groups.setdefault(self.index_for(isbn), []).append(isbn)
+        resolved: Dict[str, Book] = {}
+        for index, group in groups.items():
+            shard = self.shards[index]
+            with shard.lock:
+                found, missing = shard.catalog.get_many(group)
+            absent = set(missing)
+            resolved.update(zip((isbn for isbn in group if isbn not in absent), found))
+        found = [resolved[isbn] for isbn in isbns if isbn in resolved]
+        return found, [isbn for isbn in isbns if isbn not in resolved]
+
+    def list_books(self) -> List[Book]:
+        """Return every book, shard by shard; callers wanting a consistent view lock all shards."""
+
+        return [book for shard in self.shards for book in shard.catalog.list_books()]
+
+    def stats(self) -> CatalogStats:
+        """Combine the incrementally maintained counters of every shard."""
+
+        return CatalogStats.merged(shard.catalog.stats for shard in self.shards)
+
+    def duplicates(self) -> DuplicateIndex:
+        """Return a private index over every shard, so pairs spanning shards are found too.
+
+        Shards that already maintain an index are copied under their locks;
+        the others are indexed without holding any lock and the result is
+        handed back to the shard unless it changed in the meantime.
+        """
+
+        combined = DuplicateIndex()
+        pending: List[Tuple[CatalogShard, List[Book], int]] = []
+        with self.locked():
+            for shard in self.shards:
+                if shard.catalog.tracks_duplicates:
+                    combined.merge(shard.catalog.duplicates)
+                else:
+                    pending.append((shard, shard.catalog.list_books(), shard.catalog.version))
+        for shard, books, version in pending:
+            part = DuplicateIndex((catalog_key(book.isbn), book) for book in books)
+            combined.merge(part)
+            with shard.lock:
+                shard.catalog.adopt_duplicates(part, version)
+        return combined
+
+    def load_source(self, source: BookSource) -> None:
+        """Serve every shard from ``source``, each one indexing only its own keys.
+
+        The caller must hold every shard lock.
+        """
+
+        positions: List[Dict[CatalogKey, int]] = [{} for _ in self.shards]
+        for position, key in enumerate(source.keys()):
+            positions[self._index_for_key(key)][key] = position
+        for shard, owned in zip(self.shards, positions):
+            shard.catalog.load_source(source, owned)
+
+    def _index_for_key(self, key: CatalogKey) -> int:
+        return hash(key) % len(self.shards)
+
+    def _record(self, indexes: Tuple[int, ...]) -> None:
+        with self._journal_lock:
+            self._journal.append(indexes)
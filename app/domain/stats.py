@@ -0,0 +1,82 @@
+"""Aggregate counters maintained incrementally alongside the catalog."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from .book import Book
+
+PAGE_BUCKET_SIZE = 100
+GROUPS = ("publisher", "author", "pages")
+
+
+def page_bucket(pages: int) -> str:
+    """Return the label of the page-count bucket ``pages`` falls into."""
+
+    start = (pages // PAGE_BUCKET_SIZE) * PAGE_BUCKET_SIZE
+    return f"{start}-{start + PAGE_BUCKET_SIZE - 1}"
+
+
+class CatalogStats:
+    """Counts per publisher, author and page bucket plus overall totals.
+
+    Single-book mutations adjust the counters in O(1); bulk replacements
+    rebuild them in the same pass that already walks every book.
+    """
+
+    def __init__(self, books: Iterable[Book] = ()) -> None:
+        self.total_books = 0
+        self.total_pages = 0
+        self._groups: Dict[str, Counter] = {name: Counter() for name in GROUPS}
+        for book in books:
+            self.add(book)
+
+    @classmethod
+    def merged(cls, parts: Iterable["CatalogStats"]) -> "CatalogStats":
+        """Return counters combining several partial ones, e.g. catalog shards."""
+
+        combined = cls()
+        for part in parts:
+            combined.total_books += part.total_books
+            combined.total_pages += part.total_pages
+            for name, counter in part._groups.items():
+                combined._groups[name].update(counter)
+        return combined
+
+    def add(self, book: Book) -> None:
+        self.total_books += 1
+        self.total_pages += book.pages
+        for name, value in self._labels(book):
+            self._groups[name][value] += 1
+
+    def remove(self, book: Book) -> None:
+        self.total_books -= 1
+        self.total_pages -= book.pages
+        for name, value in self._labels(book):
+            counter = self._groups[name]
+            counter[value] -= 1
+            if counter[value] <= 0:
+                del counter[value]
+
+    def to_dict(self, group_by: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, object]:
+        """Return the totals and, when requested, the counts for one grouping.
+
+        Groups are ordered by descending count and truncated to ``limit``.
+        """
+
+        summary: Dict[str, object] = {
+            "total_books": self.total_books,
+            "total_pages": self.total_pages,
+            "average_pages": self.total_pages / self.total_books if self.total_books else 0.0,
+        }
+        if group_by is not None:
+            if group_by not in self._groups:
+                raise ValueError(f"Unsupported grouping: {group_by}")
+            summary["group_by"] = group_by
+            summary["groups"] = dict(self._groups[group_by].most_common(limit))
+        return summary
+
+    @staticmethod
+    def _labels(book: Book) -> tuple:
+        return (("publisher", book.publisher), ("author", book.author), ("pages", page_bucket(book.pages)))
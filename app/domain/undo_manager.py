@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import deque
-from typing import Deque
+from typing import Deque, List
 
 from .catalog import Catalog
 from .memento import CatalogMemento
@@ -18,12 +18,12 @@ class UndoManager:
 
         self._history.append(memento)
 
-    def undo(self, catalog: Catalog) -> None:
-        """Restore the catalog to the most recent snapshot."""
+    def undo(self, catalog: Catalog) -> List[str]:
+        """Restore the catalog to the most recent snapshot and return the changed ISBNs."""
 
         if not self._history:
             raise ValueError("No states available to undo")
-        catalog.restore(self._history.pop())
+        return catalog.restore(self._history.pop())
 
     def can_undo(self) -> bool:
         """Return ``True`` when an undo action is possible."""
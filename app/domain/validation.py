@@ -0,0 +1,186 @@
+"""Batch validation of imported records before they reach the catalog."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import isbn as isbn_rules
+from .book import Book
+
+FIELDS = ("title", "author", "isbn", "publisher", "pages")
+_TEXT_FIELDS = ("title", "author", "isbn", "publisher")
+_MISSING = object()
+_UNREADABLE = object()
+_PROGRESS_STEP = 1024
+
+Progress = Callable[[int], None]
+
+
+@dataclass(frozen=True)
+class MalformedRecord:
+    """Placeholder for a record that could not be decoded at all."""
+
+    message: str
+
+
+@dataclass(frozen=True)
+class RecordError:
+    """Problem found in a single imported record."""
+
+    index: int
+    field: Optional[str]
+    message: str
+    isbn: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"index": self.index, "field": self.field, "message": self.message, "isbn": self.isbn}
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating a batch: the valid books and what was rejected."""
+
+    total: int
+    books: List[Book]
+    errors: List[RecordError] = field(default_factory=list)
+    invalid_count: int = 0
+
+    @property
+    def valid(self) -> bool:
+        return self.invalid_count == 0
+
+    def to_dict(self, max_errors: int = 100) -> Dict[str, Any]:
+        """Return a serializable report listing at most ``max_errors`` errors."""
+
+        return {
+            "total": self.total,
+            "valid": len(self.books),
+            "invalid": self.invalid_count,
+            "errors": [error.to_dict() for error in self.errors[:max_errors]],
+        }
+
+
+class ImportValidationError(ValueError):
+    """Raised when an import contains invalid records and skipping is disabled."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        super().__init__(f"{report.invalid_count} of {report.total} records are invalid")
+        self.report = report
+
+
+class ImportValidator:
+    """Check required fields, types, ISBN checksums and duplicates column by column.
+
+    Every record is checked before any :class:`Book` is built, so a bad row
+    is reported together with all other problems instead of aborting the
+    import half-way.
+    """
+
+    def __init__(self, verify_isbn_checksum: bool = False) -> None:
+        self._verify_isbn_checksum = verify_isbn_checksum
+
+    def validate(self, records: Sequence[Any], progress: Optional[Progress] = None) -> ValidationReport:
+        """Validate raw dictionaries produced by a format strategy.
+
+        ``progress`` is told how many records were checked, in steps of
+        ``_PROGRESS_STEP``, and may raise to abort.
+        """
+
+        errors: Dict[int, List[RecordError]] = {}
+        rows: List[Optional[Dict[str, Any]]] = []
+        for index, record in enumerate(records):
+            if isinstance(record, dict):
+                rows.append(record)
+                continue
+            rows.append(None)
+            message = record.message if isinstance(record, MalformedRecord) else "record must be an object"
+            errors[index] = [RecordError(index, None, message)]
+        columns = {
+            name: [row.get(name, _MISSING) if row is not None else _UNREADABLE for row in rows]
+            for name in FIELDS
+        }
+        return self._check(columns, errors, progress=progress)
+
+    def validate_books(self, books: Sequence[Book], progress: Optional[Progress] = None) -> ValidationReport:
+        """Validate books that a typed decoder already built."""
+
+        columns = {name: [getattr(book, name) for book in books] for name in FIELDS}
+        return self._check(columns, {}, books, progress)
+
+    def _check(
+        self,
+        columns: Dict[str, List[Any]],
+        errors: Dict[int, List[RecordError]],
+        prebuilt: Optional[Sequence[Book]] = None,
+        progress: Optional[Progress] = None,
+    ) -> ValidationReport:
+        isbns = columns["isbn"]
+        total = len(isbns)
+
+        def reject(index: int, name: Optional[str], message: str) -> None:
+            isbn = isbns[index] if isinstance(isbns[index], str) else None
+            errors.setdefault(index, []).append(RecordError(index, name, message, isbn))
+
+        for name in _TEXT_FIELDS:
+            for index, value in enumerate(columns[name]):
+                if value is _UNREADABLE:
+                    continue
+                if value is _MISSING:
+                    reject(index, name, "is required")
+                elif not isinstance(value, str) or not value.strip():
+                    reject(index, name, "must be a non-empty string")
+
+        pages: List[int] = []
+        for index, value in enumerate(columns["pages"]):
+            parsed = _parse_pages(value)
+            if parsed is None and value is not _UNREADABLE:
+                reject(index, "pages", "is required" if value is _MISSING else "must be a positive integer")
+            pages.append(parsed or 0)
+
+        first_seen: Dict[isbn_rules.CatalogKey, int] = {}
+        for index, value in enumerate(isbns):
+            if not isinstance(value, str) or not value.strip():
+                continue
+            if self._verify_isbn_checksum and not isbn_rules.is_valid(value):
+                reject(index, "isbn", "is not a valid ISBN-10/13")
+            first = first_seen.setdefault(isbn_rules.catalog_key(value), index)
+            if first != index:
+                reject(index, "isbn", f"duplicates record {first}")
+
+        books: List[Book] = []
+        for index in range(total):
+            if progress is not None and index and index % _PROGRESS_STEP == 0:
+                progress(_PROGRESS_STEP)
+            if index in errors:
+                continue
+            if prebuilt is not None:
+                books.append(prebuilt[index])
+                continue
+            books.append(
+                Book(
+                    title=columns["title"][index],
+                    author=columns["author"][index],
+                    isbn=isbns[index],
+                    publisher=columns["publisher"][index],
+                    pages=pages[index],
+                )
+            )
+        if progress is not None and total:
+            progress(total - (total - 1) // _PROGRESS_STEP * _PROGRESS_STEP)
+        flattened = [error for index in sorted(errors) for error in errors[index]]
+        return ValidationReport(total=total, books=books, errors=flattened, invalid_count=len(errors))
+
+
+def _parse_pages(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if value >= 1 else None
+    if isinstance(value, str):
+        try:
+            parsed = int(value)
+        except ValueError:
+            return None
+        return parsed if parsed >= 1 else None
+    return None
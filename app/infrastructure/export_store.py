@@ -0,0 +1,72 @@
+"""Directory of serialized catalog exports, one file per format and version."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+class ExportStore:
+    """Write each catalog version once per format and hand out the file.
+
+    Files are named ``catalog-v<version>.<format>``. Writing a newer version
+    prunes older files of the same format; clients that already opened
+    them keep reading until they finish. Catalog versions restart with the
+    process, so a configured directory must not outlive it; the default is
+    a fresh temporary directory.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self._directory = directory
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        """Return the export directory, creating a private temp dir on first use."""
+
+        with self._lock:
+            if self._directory is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="book-catalog-exports-"))
+            self._directory.mkdir(parents=True, exist_ok=True)
+            return self._directory
+
+    def path_for(self, fmt: str, version: int) -> Path:
+        """Return where the export of ``version`` in ``fmt`` lives."""
+
+        return self.directory / f"catalog-v{version}.{fmt.lower()}"
+
+    def resolve(self, name: str) -> Path:
+        """Return the path of a stored export or raise :class:`FileNotFoundError`."""
+
+        path = self.directory / Path(name).name
+        if not path.is_file():
+            raise FileNotFoundError(f"Export {name} is no longer available")
+        return path
+
+    def write(self, fmt: str, version: int, chunks: Iterable[str]) -> Path:
+        """Write ``chunks`` atomically unless this version already exists."""
+
+        path = self.path_for(fmt, version)
+        if path.is_file():
+            return path
+        partial = path.with_name(f".{path.name}.{uuid.uuid4().hex}.partial")
+        try:
+            with open(partial, "w", encoding="utf-8", newline="") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+        self._prune(fmt, version)
+        return path
+
+    def _prune(self, fmt: str, version: int) -> None:
+        suffix = f".{fmt.lower()}"
+        for candidate in self.directory.glob(f"catalog-v*{suffix}"):
+            stem = candidate.name[len("catalog-v") : -len(suffix)]
+            if stem.isdigit() and int(stem) < version:
+                candidate.unlink(missing_ok=True)
@@ -2,23 +2,89 @@
 
 from __future__ import annotations
 
-from typing import Dict, Type
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, Tuple
 
-from ..formats.base import CatalogFormatStrategy
+from ..formats.base import CatalogFormatStrategy, FormatCapabilities
+from ..formats.csv_format import CsvFormatStrategy
 from ..formats.json_format import JsonFormatStrategy
+from ..formats.ndjson_format import NdjsonFormatStrategy
 from ..formats.xml_format import XmlFormatStrategy
 
+StrategyProvider = Callable[[], CatalogFormatStrategy]
+
+ENTRY_POINT_GROUP = "book_catalog.formats"
+
+logger = logging.getLogger(__name__)
+
 
 class FormatFactory:
-    """Return the appropriate strategy for the requested format."""
+    """Return the appropriate strategy for the requested format.
+
+    Formats live in a class-wide registry that plugins extend through
+    :meth:`register` or the ``book_catalog.formats`` entry point group.
+    Each factory builds a strategy once per format and reuses it, so
+    precompiled decoders and encoders are shared across calls.
+    """
 
-    _strategies: Dict[str, Type[CatalogFormatStrategy]] = {
+    _strategies: Dict[str, StrategyProvider] = {
         "json": JsonFormatStrategy,
         "xml": XmlFormatStrategy,
+        "csv": CsvFormatStrategy,
+        "ndjson": NdjsonFormatStrategy,
     }
 
+    def __init__(self) -> None:
+        self._instances: Dict[str, Tuple[StrategyProvider, CatalogFormatStrategy]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def register(cls, fmt: str, provider: StrategyProvider) -> None:
+        """Add or replace the strategy used for ``fmt``."""
+
+        cls._strategies[fmt.lower()] = provider
+
+    @classmethod
+    def load_entry_points(cls, group: str = ENTRY_POINT_GROUP) -> List[str]:
+        """Register every strategy exposed by installed plugins and return their names.
+
+        A plugin that fails to load is logged and skipped so it cannot keep
+        the application from starting.
+        """
+
+        loaded = []
+        for entry_point in entry_points(group=group):
+            try:
+                cls.register(entry_point.name, entry_point.load())
+            except Exception:
+                logger.exception("Could not load catalog format plugin %r", entry_point.name)
+                continue
+            loaded.append(entry_point.name.lower())
+        return loaded
+
+    def formats(self) -> List[str]:
+        """Return the registered format names."""
+
+        return sorted(self._strategies)
+
+    def capabilities(self, fmt: str) -> FormatCapabilities:
+        """Return what the strategy for ``fmt`` supports."""
+
+        return self.create(fmt).capabilities
+
     def create(self, fmt: str) -> CatalogFormatStrategy:
         key = fmt.lower()
         if key not in self._strategies:
             raise ValueError(f"Unsupported format: {fmt}")
-        return self._strategies[key]()
+        provider = self._strategies[key]
+        cached = self._instances.get(key)
+        if cached is not None and cached[0] is provider:
+            return cached[1]
+        with self._lock:
+            cached = self._instances.get(key)
+            if cached is None or cached[0] is not provider:
+                cached = (provider, provider())
+                self._instances[key] = cached
+        return cached[1]
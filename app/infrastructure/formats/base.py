@@ -3,11 +3,30 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List
+
+from ...domain.book import Book
+from ...domain.validation import MalformedRecord
+
+
+@dataclass(frozen=True)
+class FormatCapabilities:
+    """Features a strategy advertises so callers can pick the fastest path."""
+
+    streaming: bool = False
+    binary: bool = False
+    compression: bool = False
 
 
 class CatalogFormatStrategy(ABC):
-    """Defines serialization/deserialization hooks."""
+    """Defines serialization/deserialization hooks.
+
+    Instances are cached by :class:`FormatFactory` and shared between
+    requests, so implementations must not keep per-call state.
+    """
+
+    capabilities = FormatCapabilities()
 
     @abstractmethod
     def serialize(self, books: List[Dict[str, Any]]) -> str:
@@ -16,3 +35,95 @@ class CatalogFormatStrategy(ABC):
     @abstractmethod
     def deserialize(self, content: str) -> List[Dict[str, Any]]:
         """Convert the textual content back into dictionaries."""
+
+    def deserialize_books(self, content: str) -> List[Book]:
+        """Convert the textual content straight into :class:`Book` objects.
+
+        Strategies with a typed decoder override this to skip the intermediate
+        dictionaries.
+        """
+
+        return [Book.from_dict(entry) for entry in self.deserialize(content)]
+
+    def iter_serialize(self, books: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the document in pieces; whole-document formats yield once."""
+
+        yield self.serialize(list(books))
+
+    def iter_deserialize(self, lines: Iterable[str], lenient: bool = False) -> Iterator[Any]:
+        """Yield decoded records from an iterable of lines.
+
+        With ``lenient`` a record that cannot be decoded is yielded as a
+        :class:`MalformedRecord` instead of raising, where the format can
+        tell records apart; whole-document formats still raise.
+        """
+
+        yield from self.deserialize("".join(lines))
+
+
+def iter_lines(content: str) -> Iterator[str]:
+    """Yield the lines of ``content`` split on ``\\n`` only, without it.
+
+    Unlike :meth:`str.splitlines` this keeps U+2028, U+0085, form feeds and
+    the other separators the line encoders leave unescaped inside a record.
+    """
+
+    start = 0
+    while True:
+        end = content.find("\n", start)
+        if end == -1:
+            if start < len(content):
+                yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
+
+
+class LineFormatStrategy(CatalogFormatStrategy):
+    """Line-oriented strategy where every record is encoded independently.
+
+    Each book occupies exactly one line, so documents can be streamed, split
+    at any line boundary and processed by several workers. An optional
+    header line is emitted first and skipped wherever it appears on input.
+    """
+
+    capabilities = FormatCapabilities(streaming=True)
+    header: str | None = None
+
+    @abstractmethod
+    def encode_record(self, book: Dict[str, Any]) -> str:
+        """Return a single record without the trailing newline."""
+
+    @abstractmethod
+    def decode_record(self, line: str) -> Dict[str, Any]:
+        """Parse a single line produced by :meth:`encode_record`."""
+
+    def iter_serialize(self, books: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Yield newline-terminated lines, header first."""
+
+        if self.header is not None:
+            yield self.header + "\n"
+        for book in books:
+            yield self.encode_record(book) + "\n"
+
+    def iter_deserialize(self, lines: Iterable[str], lenient: bool = False) -> Iterator[Any]:
+        """Yield one dictionary per record, ignoring blank and header lines."""
+
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.strip() or line == self.header:
+                continue
+            try:
+                record = self.decode_record(line)
+            except ValueError as exc:
+                if not lenient:
+                    raise
+                yield MalformedRecord(f"could not be decoded: {exc}")
+                continue
+            yield record
+
+    def serialize(self, books: List[Dict[str, Any]]) -> str:
+        return "".join(self.iter_serialize(books))
+
+    def deserialize(self, content: str) -> List[Dict[str, Any]]:
+        return list(self.iter_deserialize(iter_lines(content)))
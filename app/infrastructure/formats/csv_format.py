@@ -0,0 +1,45 @@
+"""CSV format strategy with one book per line."""
+
+from __future__ import annotations
+
+import csv
+from typing import Any, Dict
+
+from .base import LineFormatStrategy
+
+_FIELDS = ("title", "author", "isbn", "publisher", "pages")
+_SPECIAL = (",", '"', "\r", "\n")
+
+
+def _quote(value: Any) -> str:
+    """Quote a field the way ``csv.QUOTE_MINIMAL`` does."""
+
+    text = str(value)
+    if any(char in text for char in _SPECIAL):
+        if "\n" in text or "\r" in text:
+            raise ValueError("CSV records cannot contain line breaks; use the ndjson format instead")
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class CsvFormatStrategy(LineFormatStrategy):
+    """Represent the catalog as CSV with a fixed column order."""
+
+    header = ",".join(_FIELDS)
+
+    def encode_record(self, book: Dict[str, Any]) -> str:
+        return ",".join(_quote(book[field]) for field in _FIELDS)
+
+    def decode_record(self, line: str) -> Dict[str, Any]:
+        try:
+            values = next(csv.reader((line,)))
+        except csv.Error as exc:
+            raise ValueError(f"Invalid CSV record: {exc}") from exc
+        if len(values) != len(_FIELDS):
+            raise ValueError(f"Expected {len(_FIELDS)} CSV columns, got {len(values)}")
+        book_data: Dict[str, Any] = dict(zip(_FIELDS, values))
+        try:
+            book_data["pages"] = int(book_data["pages"])
+        except ValueError:
+            pass
+        return book_data
@@ -0,0 +1,54 @@
+"""JSON encoding helpers that prefer orjson or msgspec when installed.
+
+Both libraries are optional: the helpers fall back to the standard library so
+the service keeps working in minimal environments.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # pragma: no cover - depends on the environment
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:  # pragma: no cover - depends on the environment
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+
+if orjson is not None:
+    ENGINE = "orjson"
+elif msgspec is not None:
+    ENGINE = "msgspec"
+else:
+    ENGINE = "json"
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON, compact unless ``indent`` is requested."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if msgspec is not None:
+        encoded = msgspec.json.encode(obj)
+        return msgspec.json.format(encoded, indent=2) if indent else encoded
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(content: str | bytes) -> Any:
+    """Decode a JSON document, raising :class:`json.JSONDecodeError` on bad input."""
+
+    if orjson is not None:
+        return orjson.loads(content)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(content)
+        except msgspec.DecodeError as exc:
+            text = content if isinstance(content, str) else content.decode("utf-8", "replace")
+            raise json.JSONDecodeError(str(exc), text, 0) from exc
+    return json.loads(content)
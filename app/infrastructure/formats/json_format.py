@@ -1,21 +1,56 @@
-"""JSON format strategy built on the standard library."""
+"""JSON format strategy using the fastest available JSON engine."""
 
 from __future__ import annotations
 
 import json
 from typing import Any, Dict, List
 
+from ...domain.book import Book
+from . import json_engine
 from .base import CatalogFormatStrategy
 
+msgspec = json_engine.msgspec
+
+if msgspec is not None:
+
+    class _CatalogDocument(msgspec.Struct):
+        """Typed view of the JSON document used for direct :class:`Book` decoding."""
+
+        catalog: List[Book] = []
+
 
 class JsonFormatStrategy(CatalogFormatStrategy):
-    """Serialize the catalog to a JSON document."""
+    """Serialize the catalog to a JSON document.
+
+    Output is indented by default; ``compact=True`` drops the whitespace.
+    """
+
+    def __init__(self, compact: bool = False) -> None:
+        self._compact = compact
+        self._decoder = msgspec.json.Decoder(_CatalogDocument, strict=False) if msgspec is not None else None
 
     def serialize(self, books: List[Dict[str, Any]]) -> str:
-        return json.dumps({"catalog": books}, indent=2)
+        return json_engine.dumps({"catalog": books}, indent=not self._compact).decode("utf-8")
 
     def deserialize(self, content: str) -> List[Dict[str, Any]]:
         if not content.strip():
             return []
-        parsed = json.loads(content)
-        return list(parsed.get("catalog", []))
+        parsed = json_engine.loads(content)
+        if not isinstance(parsed, dict):
+            raise ValueError("The JSON document must be an object with a 'catalog' list")
+        catalog = parsed.get("catalog", [])
+        if not isinstance(catalog, list):
+            raise ValueError("The 'catalog' field must be a list")
+        return catalog
+
+    def deserialize_books(self, content: str) -> List[Book]:
+        if self._decoder is None:
+            return super().deserialize_books(content)
+        if not content.strip():
+            return []
+        try:
+            return self._decoder.decode(content).catalog
+        except msgspec.ValidationError:
+            raise
+        except msgspec.DecodeError as exc:
+            raise json.JSONDecodeError(str(exc), content, 0) from exc
@@ -0,0 +1,21 @@
+"""Newline-delimited JSON format strategy."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from . import json_engine
+from .base import LineFormatStrategy
+
+
+class NdjsonFormatStrategy(LineFormatStrategy):
+    """Represent the catalog as one compact JSON object per line."""
+
+    def encode_record(self, book: Dict[str, Any]) -> str:
+        return json_engine.dumps(book).decode("utf-8")
+
+    def decode_record(self, line: str) -> Dict[str, Any]:
+        record = json_engine.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("Each NDJSON line must contain a JSON object")
+        return record
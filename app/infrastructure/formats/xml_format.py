@@ -1,36 +1,89 @@
-"""XML format strategy powered by :mod:`xml.etree.ElementTree`."""
+"""XML format strategy writing text directly and parsing incrementally."""
 
 from __future__ import annotations
 
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .base import CatalogFormatStrategy
 
+_FIELDS = ("title", "author", "isbn", "publisher", "pages")
+_CHUNK_SIZE = 64 * 1024
+
+
+def _escape(value: Any) -> str:
+    """Escape character data the same way :func:`ET.tostring` does."""
+
+    text = str(value)
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
 
 class XmlFormatStrategy(CatalogFormatStrategy):
-    """Represent the catalog using a basic XML schema."""
+    """Represent the catalog using a basic XML schema.
+
+    Serialization emits the fixed book schema as escaped text instead of
+    building an element tree. Deserialization feeds a pull parser in chunks
+    and detaches the parsed ``<book>`` elements from the root after every
+    chunk, so the tree never holds more than one chunk of records.
+    """
 
     def serialize(self, books: List[Dict[str, Any]]) -> str:
-        root = ET.Element("catalog")
+        if not books:
+            return "<catalog />"
+        parts = ["<catalog>"]
         for book in books:
-            book_el = ET.SubElement(root, "book")
-            for key, value in book.items():
-                child = ET.SubElement(book_el, key)
-                child.text = str(value)
-        return ET.tostring(root, encoding="unicode")
+            title, author, isbn, publisher, pages = (_escape(book[field]) for field in _FIELDS)
+            parts.append(
+                f"<book><title>{title}</title><author>{author}</author><isbn>{isbn}</isbn>"
+                f"<publisher>{publisher}</publisher><pages>{pages}</pages></book>"
+            )
+        parts.append("</catalog>")
+        return "".join(parts)
 
     def deserialize(self, content: str) -> List[Dict[str, Any]]:
         if not content.strip():
             return []
-        root = ET.fromstring(content)
+        parser = ET.XMLPullParser(events=("start", "end"))
         books: List[Dict[str, Any]] = []
-        for book_el in root.findall("book"):
-            book_data = {child.tag: child.text or "" for child in book_el}
+        root: Optional[ET.Element] = None
+        try:
+            for offset in range(0, len(content), _CHUNK_SIZE):
+                parser.feed(content[offset : offset + _CHUNK_SIZE])
+                root = self._collect(parser, books, root)
+            parser.close()
+            self._collect(parser, books, root)
+        except ET.ParseError as exc:
+            raise ValueError(f"Invalid XML document: {exc}") from exc
+        return books
+
+    @staticmethod
+    def _collect(
+        parser: ET.XMLPullParser,
+        books: List[Dict[str, Any]],
+        root: Optional[ET.Element],
+    ) -> Optional[ET.Element]:
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag != "book":
+                continue
+            book_data: Dict[str, Any] = {child.tag: child.text or "" for child in elem}
             if "pages" in book_data:
                 try:
                     book_data["pages"] = int(book_data["pages"])
                 except ValueError:
                     pass
             books.append(book_data)
-        return books
+        if root is not None:
+            # Detach everything parsed so far; the parser keeps its own
+            # reference to an element still open, which it keeps filling.
+            root.clear()
+        return root
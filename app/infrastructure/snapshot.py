@@ -0,0 +1,114 @@
+"""Compact, indexed binary snapshot of the catalog that can be memory-mapped.
+
+Layout (little-endian)::
+
+    header   magic "BCSNAP01" | record count (u64) | key block length (u64)
+    keys     JSON array with the catalog key of every record
+    padding  zero bytes up to an 8-byte boundary
+    offsets  count + 1 record offsets (u64) relative to the data block
+    data     one compact JSON array per record: title, author, isbn, publisher, pages
+
+Loading maps the file and parses only the key block; records are decoded
+one at a time through the offset table when first accessed.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import uuid
+from pathlib import Path
+from typing import Iterable, List
+
+from ..domain.book import Book
+from ..domain.isbn import CatalogKey, catalog_key
+from .formats import json_engine
+
+MAGIC = b"BCSNAP01"
+_HEADER = struct.Struct("<8sQQ")
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def write_snapshot(path: str | os.PathLike[str], books: Iterable[Book]) -> int:
+    """Write ``books`` atomically to ``path`` and return how many were stored."""
+
+    keys: List[CatalogKey] = []
+    records: List[bytes] = []
+    for book in books:
+        keys.append(catalog_key(book.isbn))
+        records.append(json_engine.dumps([book.title, book.author, book.isbn, book.publisher, book.pages]))
+    key_block = json_engine.dumps(keys)
+
+    target = Path(path)
+    partial = target.with_name(f".{target.name}.{uuid.uuid4().hex}.partial")
+    try:
+        with open(partial, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, len(records), len(key_block)))
+            handle.write(key_block)
+            handle.write(b"\0" * (_align(_HEADER.size + len(key_block)) - _HEADER.size - len(key_block)))
+            offset = 0
+            for record in records:
+                handle.write(_OFFSET.pack(offset))
+                offset += len(record)
+            handle.write(_OFFSET.pack(offset))
+            for record in records:
+                handle.write(record)
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+    return len(records)
+
+
+class MappedSnapshot:
+    """Read-only view of a snapshot file backed by :mod:`mmap`.
+
+    Implements the domain ``BookSource`` protocol, so a catalog can serve
+    requests straight from the mapping.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._file.close()
+            raise ValueError(f"{path} is not a catalog snapshot") from exc
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a catalog snapshot")
+        magic, self._count, key_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a catalog snapshot")
+        self._keys_start = _HEADER.size
+        self._keys_end = self._keys_start + key_length
+        self._offsets_start = _align(self._keys_end)
+        self._data_start = self._offsets_start + _OFFSET.size * (self._count + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def keys(self) -> List[CatalogKey]:
+        return json_engine.loads(self._map[self._keys_start : self._keys_end])
+
+    def load(self, position: int) -> Book:
+        if not 0 <= position < self._count:
+            raise IndexError(f"Record {position} out of range")
+        start, end = _OFFSET_PAIR.unpack_from(self._map, self._offsets_start + _OFFSET.size * position)
+        title, author, isbn, publisher, pages = json_engine.loads(
+            self._map[self._data_start + start : self._data_start + end]
+        )
+        return Book(title=title, author=author, isbn=isbn, publisher=publisher, pages=pages)
+
+    def close(self) -> None:
+        """Release the mapping and the underlying file."""
+
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
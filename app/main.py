@@ -2,16 +2,58 @@
 
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 from fastapi import FastAPI
 
-from .api.routes import router
+from .api.responses import FastJSONResponse
+from .api.routes import get_service, router
+from .domain.jobs import JobManager
+from .infrastructure.factories.format_factory import FormatFactory
+
+SNAPSHOT_ENV = "BOOK_CATALOG_SNAPSHOT"
+
+FormatFactory.load_entry_points()
+
+
+def create_app(snapshot_path: Optional[str] = None) -> FastAPI:
+    """Build the application, optionally booting from a catalog snapshot.
+
+    When ``snapshot_path`` points to an existing file the catalog is served
+    from it right away; on shutdown the snapshot is rewritten if the
+    catalog changed. Every application, and every run of its lifespan,
+    owns a fresh :class:`JobManager` that is shut down with it.
+    """
+
+    @asynccontextmanager
+    async def lifespan(instance: FastAPI) -> AsyncIterator[None]:
+        jobs = instance.state.jobs = JobManager()
+        service = get_service()
+        if snapshot_path and os.path.exists(snapshot_path):
+            service.load_snapshot(snapshot_path)
+        loaded_version = service.version
+        yield
+        jobs.shutdown()
+        if snapshot_path and service.version != loaded_version:
+            service.save_snapshot(snapshot_path)
+
+    application = FastAPI(
+        title="Book Catalog Service",
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan,
+    )
+    application.state.jobs = JobManager()
+    application.include_router(router)
+
+    @application.get("/")
+    def health_check() -> dict[str, str]:
+        """Provide a friendly ping endpoint."""
 
-app = FastAPI(title="Book Catalog Service")
-app.include_router(router)
+        return {"message": "Book catalog service ready"}
 
+    return application
 
-@app.get("/")
-def health_check() -> dict[str, str]:
-    """Provide a friendly ping endpoint."""
 
-    return {"message": "Book catalog service ready"}
+app = create_app(os.environ.get(SNAPSHOT_ENV))
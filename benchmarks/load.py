@@ -0,0 +1,302 @@
+"""Drive the API with a weighted mix of requests and report throughput and tail latency.
+
+Run with ``python -m benchmarks.load [--duration S] [--concurrency C] [--mix ...]``.
+By default the app is served by uvicorn in a background thread of this
+process, on a fresh catalog loaded from a snapshot of ``--books`` books, so
+undo never empties it; pass ``--url`` to load an already running server
+instead (e.g. one started with several uvicorn workers, so client and
+server do not share an interpreter). That server is seeded with an import.
+
+``4xx`` counts expected misses such as deleting a book an import already
+dropped or undoing with an empty history; ``errors`` counts 5xx responses
+and transport failures.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+import uvicorn
+
+from app.api.routes import create_service, get_service
+from app.domain.book import Book
+from app.infrastructure.snapshot import write_snapshot
+from app.main import create_app
+
+DEFAULT_MIX = "get=50,lookup=5,list=5,add=10,update=10,delete=5,import=2,export=3,undo=10"
+
+
+def make_books(count: int, prefix: str = "seed") -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": f"Book {idx}",
+            "author": f"Author {idx % 97}",
+            "isbn": f"{prefix}-{idx}",
+            "publisher": f"Publisher {idx % 13}",
+            "pages": 100 + idx % 900,
+        }
+        for idx in range(count)
+    ]
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one positive weight")
+    return mix
+
+
+@dataclass
+class Worker:
+    """State of one simulated client: its own RNG and the books it added."""
+
+    index: int
+    seed_isbns: List[str]
+    import_body: Dict[str, Any]
+    rng: random.Random
+    added: List[str] = field(default_factory=list)
+    counter: int = 0
+
+    def new_isbn(self) -> str:
+        self.counter += 1
+        return f"load-{self.index}-{self.counter}"
+
+
+Operation = Callable[[httpx.AsyncClient, Worker], Awaitable[httpx.Response]]
+
+
+async def op_get(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    return await client.get(f"/catalog/books/{worker.rng.choice(worker.seed_isbns)}")
+
+
+async def op_lookup(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    isbns = worker.rng.sample(worker.seed_isbns, min(20, len(worker.seed_isbns)))
+    return await client.post("/catalog/books:lookup", json={"isbns": isbns})
+
+
+async def op_list(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    return await client.get("/catalog/books")
+
+
+async def op_add(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    isbn = worker.new_isbn()
+    response = await client.post("/catalog/books", json={**make_books(1)[0], "isbn": isbn})
+    if response.status_code == 201:
+        worker.added.append(isbn)
+    return response
+
+
+async def op_update(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    isbn = worker.rng.choice(worker.seed_isbns)
+    payload = {"title": f"Updated {worker.counter}", "author": "Load", "publisher": "Load", "pages": 200}
+    return await client.put(f"/catalog/books/{isbn}", json=payload)
+
+
+async def op_delete(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    if not worker.added:
+        return await op_add(client, worker)
+    return await client.delete(f"/catalog/books/{worker.added.pop()}")
+
+
+async def op_import(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    return await client.post("/catalog/import", json=worker.import_body)
+
+
+async def op_export(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    return await client.post("/catalog/export", json={"format": "json"})
+
+
+async def op_undo(client: httpx.AsyncClient, worker: Worker) -> httpx.Response:
+    return await client.post("/catalog/undo")
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "get": op_get,
+    "lookup": op_lookup,
+    "list": op_list,
+    "add": op_add,
+    "update": op_update,
+    "delete": op_delete,
+    "import": op_import,
+    "export": op_export,
+    "undo": op_undo,
+}
+
+
+@dataclass
+class Sample:
+    operation: str
+    seconds: float
+    status: int
+
+
+async def run_load(
+    base_url: str,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    seed_isbns: List[str],
+    import_body: Dict[str, Any],
+    seed: int,
+) -> Tuple[List[Sample], float]:
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+
+        async def drive(worker: Worker, deadline: float) -> None:
+            while time.perf_counter() < deadline:
+                name = worker.rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = (await OPERATIONS[name](client, worker)).status_code
+                except httpx.HTTPError:
+                    status = 0
+                samples.append(Sample(name, time.perf_counter() - started, status))
+
+        workers = [
+            Worker(index, seed_isbns, import_body, random.Random(seed + index)) for index in range(concurrency)
+        ]
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(drive(worker, deadline) for worker in workers))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> List[Dict[str, Any]]:
+    grouped: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        grouped[sample.operation].append(sample)
+    grouped["total"] = samples
+
+    rows = []
+    for name, group in grouped.items():
+        latencies = sorted(sample.seconds for sample in group)
+        rows.append(
+            {
+                "operation": name,
+                "requests": len(group),
+                "ok": sum(1 for sample in group if 200 <= sample.status < 300),
+                "rejected": sum(1 for sample in group if sample.status == 429),
+                "client_errors": sum(1 for sample in group if 400 <= sample.status < 500 and sample.status != 429),
+                "errors": sum(1 for sample in group if sample.status == 0 or sample.status >= 500),
+                "rps": round(len(group) / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            }
+        )
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'operation':<10} {'requests':>9} {'ok':>8} {'429':>6} {'4xx':>6} {'errors':>7} {'rps':>9}"
+    header += f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    print(header)
+    for row in rows:
+        print(
+            f"{row['operation']:<10} {row['requests']:>9} {row['ok']:>8} {row['rejected']:>6}"
+            f" {row['client_errors']:>6} {row['errors']:>7}"
+            f" {row['rps']:>9.1f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+            f" {row['max_ms']:>9.2f}"
+        )
+
+
+class ServerThread:
+    """Serve ``app`` with uvicorn on a free local port from a daemon thread."""
+
+    def __init__(self, app: Any, host: str) -> None:
+        self._server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._host = host
+
+    def __enter__(self) -> str:
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.01)
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://{self._host}:{port}"
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=32, help="simultaneous clients")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"weights, default {DEFAULT_MIX}")
+    parser.add_argument("--books", type=int, default=1_000, help="books seeded before the run")
+    parser.add_argument("--import-books", type=int, help="books sent by each import, default --books")
+    parser.add_argument("--shards", type=int, default=1, help="serve a sharded catalog (local server only)")
+    parser.add_argument("--url", help="load an already running server instead of starting one")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    seed_books = make_books(args.books)
+    seed_isbns = [book["isbn"] for book in seed_books]
+    import_count = args.books if args.import_books is None else args.import_books
+    import_books = seed_books[:import_count] if import_count <= args.books else make_books(import_count)
+    import_body = {"format": "json", "content": json.dumps({"catalog": import_books})}
+
+    def run(base_url: str) -> Tuple[List[Sample], float]:
+        return asyncio.run(
+            run_load(base_url, args.mix, args.concurrency, args.duration, seed_isbns, import_body, args.seed)
+        )
+
+    if args.url:
+        httpx.post(f"{args.url}/catalog/import", json={"format": "json", "content": json.dumps({"catalog": seed_books})})
+        samples, elapsed = run(args.url)
+    else:
+        service = create_service(args.shards)
+        app = create_app()
+        app.dependency_overrides[get_service] = lambda: service
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = Path(directory) / "seed.snap"
+            write_snapshot(snapshot, (Book.from_dict(book) for book in seed_books))
+            service.load_snapshot(snapshot)
+            with ServerThread(app, args.host) as base_url:
+                samples, elapsed = run(base_url)
+
+    rows = summarize(samples, elapsed)
+    print(f"{args.concurrency} clients for {elapsed:.1f} s, {args.books} books, shards={args.shards}")
+    print_report(rows)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump({"args": {**vars(args), "mix": args.mix}, "elapsed": elapsed, "results": rows}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
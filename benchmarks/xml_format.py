@@ -0,0 +1,83 @@
+"""Compare the XML strategy with the previous ElementTree implementation.
+
+Run with ``python -m benchmarks.xml_format [--books N] [--repeat R]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List
+
+from app.infrastructure.formats.xml_format import XmlFormatStrategy
+
+
+def legacy_serialize(books: List[Dict[str, Any]]) -> str:
+    root = ET.Element("catalog")
+    for book in books:
+        book_el = ET.SubElement(root, "book")
+        for key, value in book.items():
+            child = ET.SubElement(book_el, key)
+            child.text = str(value)
+    return ET.tostring(root, encoding="unicode")
+
+
+def legacy_deserialize(content: str) -> List[Dict[str, Any]]:
+    root = ET.fromstring(content)
+    books: List[Dict[str, Any]] = []
+    for book_el in root.findall("book"):
+        book_data = {child.tag: child.text or "" for child in book_el}
+        if "pages" in book_data:
+            try:
+                book_data["pages"] = int(book_data["pages"])
+            except ValueError:
+                pass
+        books.append(book_data)
+    return books
+
+
+def make_books(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": f"Book {idx} & Co <2nd ed.>",
+            "author": f"Author {idx % 97}",
+            "isbn": f"978{idx:010d}",
+            "publisher": f"Publisher {idx % 13}",
+            "pages": 100 + idx % 900,
+        }
+        for idx in range(count)
+    ]
+
+
+def measure(label: str, func: Callable[[], object], repeat: int) -> None:
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} {seconds * 1000:>10.1f} ms {peak / 1024 / 1024:>10.1f} MiB peak")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    books = make_books(args.books)
+    strategy = XmlFormatStrategy()
+    content = strategy.serialize(books)
+    assert content == legacy_serialize(books)
+    assert strategy.deserialize(content) == legacy_deserialize(content)
+
+    print(f"{args.books} books, best of {args.repeat}")
+    measure("serialize (legacy)", lambda: legacy_serialize(books), args.repeat)
+    measure("serialize", lambda: strategy.serialize(books), args.repeat)
+    measure("deserialize (legacy)", lambda: legacy_deserialize(content), args.repeat)
+    measure("deserialize", lambda: strategy.deserialize(content), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,50 @@
 """Integration tests covering the FastAPI routes end-to-end."""
 
+import asyncio
 import json
+import time
+from pathlib import Path
 from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.routes import get_service
+from app.api import routes
+from app.api.admission import AdmissionController
+from app.api.routes import get_admission, get_jobs, get_service
 from app.domain.catalog import Catalog
-from app.domain.services import CatalogService
+from app.domain.jobs import JobManager
+from app.domain.services import BaseCatalogService, CatalogService, ShardedCatalogService
+from app.domain.sharded_catalog import ShardedCatalog
 from app.domain.undo_manager import UndoManager
+from app.infrastructure.export_store import ExportStore
 from app.infrastructure.factories.format_factory import FormatFactory
-from app.main import app
+from app.infrastructure.snapshot import MappedSnapshot
+from app.main import app, create_app
 
 
-@pytest.fixture()
-def client() -> Generator[TestClient, None, None]:
-    service = CatalogService(Catalog(), UndoManager(), FormatFactory())
+@pytest.fixture(params=["single", "sharded"])
+def client(request: pytest.FixtureRequest, tmp_path: Path) -> Generator[TestClient, None, None]:
+    if request.param == "sharded":
+        service: BaseCatalogService = ShardedCatalogService(ShardedCatalog(4), FormatFactory(), ExportStore(tmp_path))
+    else:
+        service = CatalogService(Catalog(), UndoManager(), FormatFactory(), ExportStore(tmp_path))
+    jobs = JobManager()
     app.dependency_overrides[get_service] = lambda: service
+    app.dependency_overrides[get_jobs] = lambda: jobs
     test_client = TestClient(app)
     yield test_client
     app.dependency_overrides.clear()
+    jobs.shutdown()
+
+
+def wait_for_job(client: TestClient, url: str) -> dict:
+    deadline = time.monotonic() + 5
+    while True:
+        job = client.get(url).json()
+        if job["status"] not in {"pending", "running"} or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
 
 
 def sample_book(isbn: str = "999") -> dict[str, str | int]:
@@ -60,6 +84,32 @@ def test_book_lifecycle(client: TestClient) -> None:
     assert delete_response.json()["status"] == "deleted"
 
 
+def test_lookup_many_books(client: TestClient) -> None:
+    for isbn in ("111", "222"):
+        client.post("/catalog/books", json=sample_book(isbn))
+
+    response = client.post("/catalog/books:lookup", json={"isbns": ["222", "404", "111", "222"]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [book["isbn"] for book in body["books"]] == ["222", "111"]
+    assert body["missing"] == ["404"]
+    assert client.post("/catalog/books:lookup", json={"isbns": []}).status_code == 422
+
+
+def test_catalog_stats(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("601"))
+    client.post("/catalog/books", json={**sample_book("602"), "publisher": "Other", "pages": 120})
+
+    totals = client.get("/catalog/stats").json()
+    assert totals == {"total_books": 2, "total_pages": 320, "average_pages": 160.0}
+
+    grouped = client.get("/catalog/stats", params={"group_by": "publisher", "limit": 1}).json()
+    assert grouped["group_by"] == "publisher"
+    assert len(grouped["groups"]) == 1
+    assert client.get("/catalog/stats", params={"group_by": "isbn"}).status_code == 422
+
+
 def test_import_export_json(client: TestClient) -> None:
     payload = {"catalog": [sample_book("101")]}  # type: ignore[list-item]
 
@@ -90,6 +140,195 @@ def test_import_export_xml(client: TestClient) -> None:
     assert "<isbn>202</isbn>" in export_response.json()["content"]
 
 
+def test_import_export_line_formats(client: TestClient) -> None:
+    csv_payload = "title,author,isbn,publisher,pages\nCSV,Tester,303,Press,120\n"
+
+    import_response = client.post("/catalog/import", json={"format": "csv", "content": csv_payload})
+    assert import_response.status_code == 200
+    assert import_response.json()["count"] == 1
+
+    export_response = client.post("/catalog/export", json={"format": "ndjson"})
+    assert export_response.status_code == 200
+    lines = export_response.json()["content"].splitlines()
+    assert [json.loads(line)["isbn"] for line in lines] == ["303"]
+
+
+def test_export_job_serves_file_with_ranges(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("888"))
+
+    job_id = client.post("/catalog/export-jobs", json={"format": "json"}).json()["id"]
+    job = wait_for_job(client, f"/catalog/export-jobs/{job_id}")
+    assert job["status"] == "succeeded"
+    assert job["processed"] == 1
+
+    download = client.get(f"/catalog/export-jobs/{job_id}/download")
+    assert download.status_code == 200
+    assert download.headers["accept-ranges"] == "bytes"
+    assert json.loads(download.content)["catalog"][0]["isbn"] == "888"
+
+    partial = client.get(f"/catalog/export-jobs/{job_id}/download", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.content == download.content[:10]
+    assert partial.headers["content-range"] == f"bytes 0-9/{len(download.content)}"
+
+    suffix = client.get(f"/catalog/export-jobs/{job_id}/download", headers={"Range": "bytes=-5"})
+    assert suffix.content == download.content[-5:]
+
+    beyond = client.get(f"/catalog/export-jobs/{job_id}/download", headers={"Range": "bytes=100000-"})
+    assert beyond.status_code == 416
+
+    head = client.head(f"/catalog/export-jobs/{job_id}/download")
+    assert head.status_code == 200
+    assert head.headers["accept-ranges"] == "bytes"
+    assert head.headers["content-length"] == str(len(download.content))
+    assert head.content == b""
+
+    head_partial = client.head(f"/catalog/export-jobs/{job_id}/download", headers={"Range": "bytes=0-9"})
+    assert head_partial.status_code == 206
+    assert head_partial.headers["content-length"] == "10"
+    assert head_partial.content == b""
+
+
+def run_export_job(client: TestClient, fmt: str) -> dict:
+    job_id = client.post("/catalog/export-jobs", json={"format": fmt}).json()["id"]
+    return wait_for_job(client, f"/catalog/export-jobs/{job_id}")
+
+
+def test_export_job_reuses_file_per_version(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("889"))
+    first = run_export_job(client, "csv")
+    second = run_export_job(client, "csv")
+    assert first["result"] == second["result"]
+
+    client.post("/catalog/books", json=sample_book("890"))
+    third = run_export_job(client, "csv")
+    assert third["result"]["version"] > first["result"]["version"]
+    assert client.get(f"/catalog/export-jobs/{first['id']}/download").status_code == 410
+    assert client.get(f"/catalog/export-jobs/{third['id']}/download").status_code == 200
+
+
+def test_list_formats(client: TestClient) -> None:
+    response = client.get("/catalog/formats")
+
+    assert response.status_code == 200
+    formats = {fmt["name"]: fmt for fmt in response.json()}
+    assert {"json", "xml", "csv", "ndjson"} <= formats.keys()
+    assert formats["csv"]["streaming"] is True
+    assert formats["json"]["streaming"] is False
+
+
+def test_duplicates_endpoint_and_import_flag(client: TestClient) -> None:
+    client.post("/catalog/books", json={**sample_book("801"), "title": "Dom Casmurro", "author": "Machado de Assis"})
+    client.post("/catalog/books", json={**sample_book("802"), "title": "Dom Casmurro.", "author": "Machado de Assis"})
+    client.post("/catalog/books", json={**sample_book("803"), "title": "Quincas Borba", "author": "Machado de Assis"})
+
+    body = client.get("/catalog/duplicates").json()
+    assert body["pairs"] == [{"isbns": ["801", "802"], "similarity": 1.0}]
+    assert body["truncated"] is False and body["skipped_buckets"] == 0
+    client.post("/catalog/books", json={**sample_book("804"), "title": "Dom Casmurro!", "author": "Machado de Assis"})
+    limited = client.get("/catalog/duplicates", params={"limit": 1}).json()
+    assert len(limited["pairs"]) == 1 and limited["truncated"] is True
+    client.delete("/catalog/books/804")
+    client.delete("/catalog/books/802")
+    assert client.get("/catalog/duplicates").json()["pairs"] == []
+    assert client.get("/catalog/duplicates", params={"threshold": 2}).status_code == 422
+
+    records = [
+        {**sample_book("811"), "title": "The Pragmatic Programmer", "author": "Andrew Hunt"},
+        {**sample_book("812"), "title": "Pragmatic Programmer, The", "author": "Andrew Hunt"},
+    ]
+    content = json.dumps({"catalog": records})
+    imported = client.post("/catalog/import", json={"format": "json", "content": content, "detect_duplicates": True})
+    assert imported.status_code == 200
+    assert [pair["isbns"] for pair in imported.json()["duplicates"]] == [["811", "812"]]
+    assert "duplicates" not in client.post("/catalog/import", json={"format": "json", "content": content}).json()
+    assert client.get("/catalog/duplicates").json()["pairs"][0]["isbns"] == ["811", "812"]
+    client.post("/catalog/undo")
+    assert client.get("/catalog/duplicates").json()["pairs"][0]["isbns"] == ["811", "812"]
+
+
+def test_heavy_requests_are_rejected_while_point_reads_pass(client: TestClient) -> None:
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    app.dependency_overrides[get_admission] = lambda: controller
+    client.post("/catalog/books", json=sample_book("901"))
+    asyncio.run(controller.acquire())
+
+    rejected = client.get("/catalog/books")
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert client.post("/catalog/undo").status_code == 429
+    assert client.get("/catalog/duplicates").status_code == 429
+    assert client.get("/catalog/books/901").status_code == 200
+    metrics = client.get("/catalog/admission").json()
+    assert metrics["active"] == 1
+    assert metrics["rejected"] == 3
+
+    controller.release()
+    assert client.get("/catalog/books").status_code == 200
+    assert client.get("/catalog/admission").json()["active"] == 0
+
+
+def test_import_reports_invalid_records(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("700"))
+    records = [sample_book("701"), {"title": "No ISBN"}, {**sample_book("703"), "pages": "many"}, sample_book("701")]
+    content = json.dumps({"catalog": records})
+
+    rejected = client.post("/catalog/import", json={"format": "json", "content": content})
+    assert rejected.status_code == 400
+    detail = rejected.json()["detail"]
+    assert detail["total"] == 4
+    assert detail["invalid"] == 3
+    assert {(error["index"], error["field"]) for error in detail["errors"]} >= {(1, "isbn"), (2, "pages"), (3, "isbn")}
+    assert [book["isbn"] for book in client.get("/catalog/books").json()] == ["700"]
+
+    skipped = client.post("/catalog/import", json={"format": "json", "content": content, "skip_invalid": True})
+    assert skipped.status_code == 200
+    assert skipped.json()["count"] == 1
+    assert skipped.json()["skipped"] == 3
+    assert [book["isbn"] for book in client.get("/catalog/books").json()] == ["701"]
+
+
+def test_import_job_runs_in_background(client: TestClient) -> None:
+    content = "".join(json.dumps(sample_book(str(1000 + idx))) + "\n" for idx in range(5))
+
+    submit_response = client.post("/catalog/import-jobs", json={"format": "ndjson", "content": content})
+    assert submit_response.status_code == 202
+    job_id = submit_response.json()["id"]
+
+    job = wait_for_job(client, f"/catalog/import-jobs/{job_id}")
+    assert job["status"] == "succeeded"
+    assert job["processed"] == 5
+    assert job["result"]["count"] == 5
+    assert len(client.get("/catalog/books").json()) == 5
+
+    assert client.delete(f"/catalog/import-jobs/{job_id}").status_code == 409
+    assert client.get("/catalog/import-jobs/unknown").status_code == 404
+
+
+def test_import_job_uses_typed_path_for_whole_documents(client: TestClient) -> None:
+    content = json.dumps({"catalog": [sample_book(str(2000 + idx)) for idx in range(4)]})
+
+    job_id = client.post("/catalog/import-jobs", json={"format": "json", "content": content}).json()["id"]
+
+    job = wait_for_job(client, f"/catalog/import-jobs/{job_id}")
+    assert job["status"] == "succeeded"
+    assert job["processed"] == 4
+    assert job["result"]["count"] == 4
+
+
+def test_import_job_reports_errors(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("777"))
+    bad_format = client.post("/catalog/import-jobs", json={"format": "yaml", "content": ""})
+    assert bad_format.status_code == 400
+
+    job_id = client.post("/catalog/import-jobs", json={"format": "json", "content": "{invalid}"}).json()["id"]
+
+    job = wait_for_job(client, f"/catalog/import-jobs/{job_id}")
+    assert job["status"] == "failed"
+    assert job["errors"]
+    assert [book["isbn"] for book in client.get("/catalog/books").json()] == ["777"]
+
+
 def test_invalid_format_returns_error(client: TestClient) -> None:
     import_response = client.post("/catalog/import", json={"format": "yaml", "content": ""})
     assert import_response.status_code in {400, 422}
@@ -103,6 +342,25 @@ def test_import_invalid_payload_returns_error(client: TestClient) -> None:
     response = client.post("/catalog/import", json={"format": "json", "content": "{invalid}"})
     assert response.status_code == 400
 
+    for fmt, content in (("json", '[{"isbn": "1"}]'), ("xml", "<catalog><book><title>Cut")):
+        response = client.post("/catalog/import", json={"format": fmt, "content": content})
+        assert response.status_code == 400
+
+
+def test_import_reports_malformed_lines(client: TestClient) -> None:
+    lines = [json.dumps(sample_book("801")), '{"title": "cut', json.dumps(sample_book("803"))]
+    content = "\n".join(lines) + "\n"
+
+    rejected = client.post("/catalog/import", json={"format": "ndjson", "content": content})
+    assert rejected.status_code == 400
+    assert [(error["index"], error["field"]) for error in rejected.json()["detail"]["errors"]] == [(1, None)]
+
+    skipped = client.post("/catalog/import", json={"format": "ndjson", "content": content, "skip_invalid": True})
+    assert skipped.status_code == 200
+    assert skipped.json()["count"] == 2
+    assert skipped.json()["skipped"] == 1
+    assert {book["isbn"] for book in client.get("/catalog/books").json()} == {"801", "803"}
+
 
 
 def test_undo_flow_and_multiple_undos(client: TestClient) -> None:
@@ -113,17 +371,119 @@ def test_undo_flow_and_multiple_undos(client: TestClient) -> None:
     )
     client.delete("/catalog/books/444")
 
-    first_undo = client.post("/catalog/undo")
+    first_undo = client.post("/catalog/undo", params={"include_books": True})
     assert first_undo.status_code == 200
     assert first_undo.json()["books"][0]["title"] == "Changed"
 
-    second_undo = client.post("/catalog/undo")
+    second_undo = client.post("/catalog/undo", params={"include_books": True})
     assert second_undo.status_code == 200
     assert second_undo.json()["books"][0]["title"] == "Integration"
 
-    third_undo = client.post("/catalog/undo")
+    third_undo = client.post("/catalog/undo", params={"include_books": True})
     assert third_undo.status_code == 200
     assert third_undo.json()["books"] == []
 
     final_undo = client.post("/catalog/undo")
     assert final_undo.status_code == 400
+
+
+def test_undo_returns_summary_without_listing(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("555"))
+    client.post("/catalog/books", json=sample_book("556"))
+    client.put(
+        "/catalog/books/555",
+        json={"title": "Changed", "author": "Tester", "publisher": "Press", "pages": 210},
+    )
+
+    response = client.post("/catalog/undo", params={"include_changed_books": True})
+    assert response.status_code == 200
+    body = response.json()
+    assert "books" not in body
+    assert body["changed_isbns"] == ["555"]
+    assert body["changed_books"][0]["title"] == "Integration"
+    assert body["remaining_undos"] == 2
+
+    removed = client.post("/catalog/undo").json()
+    assert removed["changed_isbns"] == ["556"]
+    assert "changed_books" not in removed
+    assert removed["version"] > body["version"]
+
+
+def test_undo_of_import_caps_changed_isbns(client: TestClient) -> None:
+    content = json.dumps({"catalog": [sample_book(str(1000 + idx)) for idx in range(30)]})
+    client.post("/catalog/import", json={"format": "json", "content": content})
+
+    body = client.post("/catalog/undo", params={"limit": 10}).json()
+
+    assert body["changed_count"] == 30
+    assert len(body["changed_isbns"]) == 10
+    assert body["truncated"] is True
+    assert "changed_books" not in body
+
+
+def test_app_boots_from_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "catalog.snap"
+    seed = CatalogService(Catalog(), UndoManager(), FormatFactory(), ExportStore(tmp_path))
+    seed.add_book(sample_book("321"))
+    seed.save_snapshot(path)
+    monkeypatch.setattr(routes, "_service", CatalogService(Catalog(), UndoManager(), FormatFactory()))
+
+    with TestClient(create_app(str(path))) as booted:
+        assert booted.get("/catalog/books/321").json()["title"] == "Integration"
+        booted.post("/catalog/books", json=sample_book("322"))
+
+    assert len(MappedSnapshot(path)) == 2
+
+
+def test_each_app_runs_its_own_job_manager(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(routes, "_service", CatalogService(Catalog(), UndoManager(), FormatFactory()))
+    content = json.dumps({"catalog": [sample_book("331")]})
+
+    for _ in range(2):
+        with TestClient(create_app()) as running:
+            job_id = running.post("/catalog/import-jobs", json={"format": "json", "content": content}).json()["id"]
+            assert wait_for_job(running, f"/catalog/import-jobs/{job_id}")["status"] == "succeeded"
+
+
+def test_job_submission_is_rejected_when_the_queue_is_full(client: TestClient) -> None:
+    app.dependency_overrides[get_jobs] = lambda: JobManager(max_pending=0)
+    content = json.dumps({"catalog": [sample_book("341")]})
+
+    rejected = client.post("/catalog/import-jobs", json={"format": "json", "content": content})
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert client.post("/catalog/export-jobs", json={"format": "json"}).status_code == 429
+
+
+def test_update_through_equivalent_isbn_keeps_stored_spelling(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("978-0-13-110362-7"))
+
+    response = client.put(
+        "/catalog/books/0131103628",
+        json={"title": "Renamed", "author": "Tester", "publisher": "Press", "pages": 10},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["isbn"] == "978-0-13-110362-7"
+    assert client.get("/catalog/books/9780131103627").json()["title"] == "Renamed"
+
+
+def test_lookup_resolves_equivalent_isbns_once(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("978-0-13-110362-7"))
+
+    response = client.post("/catalog/books:lookup", json={"isbns": ["0131103628", "9780131103627", "x", "X"]})
+
+    body = response.json()
+    assert [book["isbn"] for book in body["books"]] == ["978-0-13-110362-7"]
+    assert body["missing"] == ["x", "X"]
+
+
+def test_failed_writes_leave_no_undo_state(client: TestClient) -> None:
+    client.post("/catalog/books", json=sample_book("351"))
+    assert client.post("/catalog/books", json=sample_book("351")).status_code == 400
+    assert client.delete("/catalog/books/missing").status_code == 404
+
+    body = client.post("/catalog/undo").json()
+
+    assert body["changed_isbns"] == ["351"]
+    assert body["remaining_undos"] == 0
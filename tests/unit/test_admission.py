@@ -0,0 +1,75 @@
+"""Admission controller unit tests."""
+
+import asyncio
+
+import pytest
+
+from app.api.admission import AdmissionController, AdmissionRejected
+
+
+def test_caps_concurrency_and_hands_slots_to_waiters_in_order() -> None:
+    async def scenario() -> list:
+        controller = AdmissionController(max_concurrent=2, max_queue=4)
+        running = 0
+        peak = 0
+        order = []
+
+        async def request(name: int) -> None:
+            nonlocal running, peak
+            async with controller.slot():
+                running += 1
+                peak = max(peak, running)
+                order.append(name)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request(name) for name in range(6)))
+        metrics = controller.metrics()
+        assert peak == 2
+        assert metrics["admitted"] == 6
+        assert metrics["active"] == 0
+        assert metrics["queued"] == 0
+        assert metrics["wait_ms"]["max"] > 0
+        return order
+
+    assert asyncio.run(scenario()) == list(range(6))
+
+
+def test_rejects_when_queue_is_full() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        assert rejected.value.retry_after >= 1
+        assert controller.metrics()["queued"] == 1
+
+        controller.release()
+        await queued
+        assert controller.metrics()["active"] == 1
+        assert controller.metrics()["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiting_too_long_is_rejected_and_leaves_the_queue() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController(max_concurrent=1, max_queue=2, max_wait=0.01)
+        await controller.acquire()
+
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+
+        assert controller.metrics()["queued"] == 0
+        controller.release()
+        assert controller.metrics()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_rejects_invalid_limits() -> None:
+    with pytest.raises(ValueError):
+        AdmissionController(max_concurrent=0)
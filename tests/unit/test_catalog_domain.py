@@ -54,3 +54,49 @@ def test_missing_isbn_raises_error() -> None:
 
     with pytest.raises(KeyError):
         catalog.get_book("missing")
+
+
+def test_get_many_splits_found_and_missing() -> None:
+    catalog = Catalog()
+    catalog.add_book(make_book("001"))
+    catalog.add_book(make_book("002"))
+
+    found, missing = catalog.get_many(["002", "missing", "001"])
+
+    assert [book.isbn for book in found] == ["002", "001"]
+    assert missing == ["missing"]
+
+
+def test_equivalent_isbn_forms_share_one_entry() -> None:
+    catalog = Catalog()
+    catalog.add_book(make_book("978-0-13-110362-7"))
+
+    assert catalog.get_book("0131103628").isbn == "978-0-13-110362-7"
+    assert catalog.get_book("9780131103627").isbn == "978-0-13-110362-7"
+    with pytest.raises(ValueError):
+        catalog.add_book(make_book("0-13-110362-8"))
+
+    catalog.remove_book("0131103628")
+    assert catalog.list_books() == []
+
+
+def test_stats_follow_every_mutation() -> None:
+    catalog = Catalog()
+    catalog.add_book(make_book("001"))
+    catalog.add_book(Book(title="Other", author="Second", isbn="002", publisher="Press", pages=250))
+    memento = catalog.create_memento()
+
+    catalog.update_book("001", Book(title="Title", author="Second", isbn="001", publisher="House", pages=123))
+    catalog.remove_book("002")
+
+    summary = catalog.stats.to_dict(group_by="publisher")
+    assert summary["total_books"] == 1
+    assert summary["total_pages"] == 123
+    assert summary["groups"] == {"House": 1}
+
+    catalog.restore(memento)
+    assert catalog.stats.to_dict(group_by="author")["groups"] == {"Author": 1, "Second": 1}
+    assert catalog.stats.to_dict(group_by="pages")["groups"] == {"100-199": 1, "200-299": 1}
+
+    catalog.replace_all([])
+    assert catalog.stats.to_dict() == {"total_books": 0, "total_pages": 0, "average_pages": 0.0}
@@ -0,0 +1,166 @@
+"""Near-duplicate detection unit tests."""
+
+import random
+import string
+
+from app.domain.book import Book
+from app.domain.catalog import Catalog
+from app.domain.duplicates import DuplicateIndex, normalize, signature, similarity
+from app.domain.isbn import catalog_key
+from app.domain.services import CatalogService
+from app.domain.undo_manager import UndoManager
+from app.infrastructure.factories.format_factory import FormatFactory
+from app.infrastructure.formats.json_format import JsonFormatStrategy
+
+
+def make_book(isbn: str, title: str, author: str = "Author") -> Book:
+    return Book(title=title, author=author, isbn=isbn, publisher="Press", pages=100)
+
+
+def test_normalize_strips_case_accents_and_punctuation() -> None:
+    assert normalize("  Memórias Póstumas de Brás Cubas!! ") == "memorias postumas de bras cubas"
+
+
+def test_normalize_keeps_non_latin_letters() -> None:
+    assert normalize("ПРЕСТУПЛЕНИЕ  и Наказание!") == "преступление и наказание"
+    assert normalize("Ёлка") == "елка"
+    assert normalize("三体：黑暗森林") == "三体 黑暗森林"
+    assert normalize("¿¡…!?") == ""
+
+
+def test_index_pairs_non_latin_titles_by_content() -> None:
+    books = [
+        make_book("1", "Война и мир", "Лев Толстой"),
+        make_book("2", "Анна Каренина", "Лев Толстой"),
+        make_book("3", "ВОЙНА И МИР.", "Лев Толстой"),
+        make_book("4", "三体", "刘慈欣"),
+        make_book("5", "活着", "余华"),
+        make_book("6", "三体!", "刘慈欣"),
+    ]
+    index = DuplicateIndex((book.isbn, book) for book in books)
+
+    assert {(pair.first, pair.second) for pair in index.pairs()} == {("1", "3"), ("4", "6")}
+
+
+def test_books_without_shingles_are_not_indexed() -> None:
+    index = DuplicateIndex([("a", make_book("a", "???", "!!!")), ("b", make_book("b", "...", "--"))])
+
+    assert signature(make_book("a", "???", "!!!")) is None
+    assert len(index) == 0
+    assert index.pairs() == []
+
+
+def test_signature_similarity_tracks_text_overlap() -> None:
+    original = signature(make_book("1", "The Pragmatic Programmer", "Andrew Hunt"))
+    reordered = signature(make_book("2", "Pragmatic Programmer, The", "Andrew Hunt"))
+    unrelated = signature(make_book("3", "Grande Sertão: Veredas", "João Guimarães Rosa"))
+
+    assert similarity(original, original) == 1.0
+    assert similarity(original, reordered) >= 0.6
+    assert similarity(original, unrelated) < 0.3
+
+
+def test_index_finds_pairs_without_comparing_everything() -> None:
+    rng = random.Random(7)
+    titles = [" ".join("".join(rng.sample(string.ascii_lowercase, 6)) for _ in range(3)) for _ in range(200)]
+    books = [make_book(f"isbn-{idx}", title) for idx, title in enumerate(titles)]
+    books.append(make_book("copy", titles[5].upper() + "."))
+    index = DuplicateIndex((book.isbn, book) for book in books)
+
+    pairs = index.pairs()
+
+    assert [(pair.first, pair.second) for pair in pairs] == [("copy", "isbn-5")]
+    index.remove("copy")
+    assert index.pairs() == []
+
+
+def test_merged_index_finds_pairs_across_parts() -> None:
+    left = DuplicateIndex([("a", make_book("a", "Dom Casmurro"))])
+    right = DuplicateIndex([("b", make_book("b", "Dom  Casmurro"))])
+
+    merged = DuplicateIndex.merged([left, right])
+
+    assert len(merged) == 2
+    assert [pair.to_dict() for pair in merged.pairs()] == [{"isbns": ["a", "b"], "similarity": 1.0}]
+
+
+def test_catalog_keeps_index_current_through_updates_and_undo() -> None:
+    catalog = Catalog()
+    history = UndoManager()
+    catalog.add_book(make_book("001", "Dom Casmurro"))
+    catalog.add_book(make_book("002", "Quincas Borba"))
+    assert catalog.duplicates.pairs() == []
+
+    history.record_state(catalog.create_memento())
+    catalog.update_book("002", make_book("002", "Dom Casmurro"))
+    assert len(catalog.duplicates.pairs()) == 1
+
+    history.undo(catalog)
+    assert catalog.duplicates.pairs() == []
+
+
+def test_import_hands_its_index_to_the_catalog_only_when_detecting() -> None:
+    service = CatalogService(Catalog(), UndoManager(), FormatFactory())
+    service.add_book(make_book("001", "Dom Casmurro").to_dict())
+    assert service.duplicates()["pairs"] == []
+    books = [make_book(f"1{idx:02}", title) for idx, title in enumerate(["Iracema", "Iracema!", "Senhora"])]
+    content = JsonFormatStrategy().serialize([book.to_dict() for book in books])
+
+    service.import_catalog(content, "json")
+    assert not service._catalog.tracks_duplicates
+
+    service.import_catalog(content, "json", detect_duplicates=True)
+    assert service._catalog.tracks_duplicates
+    assert [pair["isbns"] for pair in service.duplicates()["pairs"]] == [["100", "101"]]
+
+
+def test_catalog_drops_index_when_undo_changes_most_books() -> None:
+    catalog = Catalog()
+    history = UndoManager()
+    catalog.add_book(make_book("001", "Dom Casmurro"))
+    assert catalog.duplicates.pairs() == []
+    history.record_state(catalog.create_memento())
+    catalog.replace_all([make_book("002", "Iracema"), make_book("003", "Senhora")])
+
+    history.undo(catalog)
+
+    assert not catalog.tracks_duplicates
+    assert len(catalog.duplicates) == 1
+
+
+def test_catalog_adopts_only_an_index_of_the_current_version() -> None:
+    catalog = Catalog()
+    catalog.add_book(make_book("001", "Dom Casmurro"))
+    version = catalog.version
+    index = DuplicateIndex([(catalog_key("001"), make_book("001", "Dom Casmurro"))])
+    catalog.add_book(make_book("002", "Iracema"))
+
+    catalog.adopt_duplicates(index, version)
+    assert not catalog.tracks_duplicates
+
+    current = DuplicateIndex((catalog_key(book.isbn), book) for book in catalog.list_books())
+    catalog.adopt_duplicates(current, catalog.version)
+    assert catalog.duplicates is current
+
+
+def test_index_subset_and_copy_are_independent() -> None:
+    index = DuplicateIndex([("a", make_book("a", "Dom Casmurro")), ("b", make_book("b", "Dom Casmurro!"))])
+    copy = index.copy()
+    part = index.subset(["a", "missing"])
+
+    index.remove("a")
+
+    assert len(copy) == 2 and len(copy.pairs()) == 1
+    assert len(part) == 1
+
+
+def test_find_skips_oversized_buckets_and_keeps_the_top_pairs() -> None:
+    books = [make_book(f"vol-{idx}", f"Annual Report of the Company volume {idx}") for idx in range(400)]
+    books.append(make_book("copy", "ANNUAL REPORT of the company, volume 7"))
+    index = DuplicateIndex((book.isbn, book) for book in books)
+
+    matches = index.find(limit=1)
+
+    assert matches.skipped_buckets > 0
+    assert [(pair.first, pair.second) for pair in matches.pairs] == [("copy", "vol-7")]
+    assert index.find(limit=5).pairs == index.find().pairs[:5]
@@ -0,0 +1,103 @@
+"""Tests covering the background job manager."""
+
+import threading
+import time
+
+import pytest
+
+from app.domain.jobs import CANCELLED, FAILED, SUCCEEDED, Job, JobManager, JobQueueFull
+
+
+def wait_until_finished(manager: JobManager, job_id: str) -> Job:
+    deadline = time.monotonic() + 5
+    job = manager.get(job_id)
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_job_reports_progress_and_result() -> None:
+    manager = JobManager(max_workers=1)
+
+    def work(job: Job) -> dict:
+        for _ in range(3):
+            job.advance()
+        return {"count": 3}
+
+    job = wait_until_finished(manager, manager.submit("import", work).id)
+
+    assert job.status == SUCCEEDED
+    assert job.processed == 3
+    assert job.result == {"count": 3}
+    assert job.finished_at is not None
+    manager.shutdown()
+
+
+def test_job_failure_is_reported() -> None:
+    manager = JobManager(max_workers=1)
+
+    def work(job: Job) -> dict:
+        raise ValueError("bad payload")
+
+    job = wait_until_finished(manager, manager.submit("import", work).id)
+
+    assert job.status == FAILED
+    assert job.errors == ["ValueError: bad payload"]
+    manager.shutdown()
+
+
+def test_cancel_stops_running_job() -> None:
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def work(job: Job) -> dict:
+        started.set()
+        while True:
+            job.advance()
+            time.sleep(0.001)
+
+    job = manager.submit("import", work)
+    assert started.wait(5)
+    manager.cancel(job.id)
+
+    assert wait_until_finished(manager, job.id).status == CANCELLED
+    with pytest.raises(ValueError):
+        manager.cancel(job.id)
+    with pytest.raises(KeyError):
+        manager.get("missing")
+    manager.shutdown()
+
+
+def test_finished_jobs_are_evicted_beyond_retention() -> None:
+    manager = JobManager(max_workers=1, retention=2)
+    ids = [manager.submit("import", lambda job: {}).id for _ in range(3)]
+    wait_until_finished(manager, ids[-1])
+
+    manager.submit("import", lambda job: {})
+
+    with pytest.raises(KeyError):
+        manager.get(ids[0])
+    manager.shutdown()
+
+
+def test_submit_refuses_jobs_beyond_max_pending() -> None:
+    manager = JobManager(max_workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(job: Job) -> dict:
+        started.set()
+        release.wait(5)
+        return {}
+
+    running = manager.submit("import", block)
+    assert started.wait(5)
+    queued = manager.submit("import", lambda job: {})
+    with pytest.raises(JobQueueFull):
+        manager.submit("import", lambda job: {})
+
+    release.set()
+    assert wait_until_finished(manager, queued.id).status == SUCCEEDED
+    assert wait_until_finished(manager, running.id).status == SUCCEEDED
+    manager.submit("import", lambda job: {})
+    manager.shutdown()
@@ -19,9 +19,10 @@ def test_undo_restores_previous_state() -> None:
     undo.record_state(catalog.create_memento())
     catalog.add_book(Book(title="Second", author="B", isbn="BBB", publisher="Press", pages=120))
 
-    undo.undo(catalog)
+    changed = undo.undo(catalog)
 
     assert [book.isbn for book in catalog.list_books()] == ["AAA"]
+    assert changed == ["BBB"]
 
 
 def test_history_limit_is_enforced() -> None:
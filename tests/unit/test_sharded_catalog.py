@@ -0,0 +1,108 @@
+"""Sharded catalog and service unit tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.domain.book import Book
+from app.domain.services import BaseCatalogService, CatalogService, ShardedCatalogService
+from app.domain.sharded_catalog import ShardedCatalog
+from app.infrastructure.export_store import ExportStore
+from app.infrastructure.factories.format_factory import FormatFactory
+from app.infrastructure.snapshot import write_snapshot
+
+
+def make_payload(isbn: str, title: str = "Title") -> dict:
+    return {"title": title, "author": "Author", "isbn": isbn, "publisher": "Press", "pages": 120}
+
+
+@pytest.fixture()
+def service(tmp_path: Path) -> ShardedCatalogService:
+    return ShardedCatalogService(ShardedCatalog(4), FormatFactory(), ExportStore(tmp_path))
+
+
+def test_books_are_spread_over_shards(tmp_path: Path) -> None:
+    catalog = ShardedCatalog(4)
+    service = ShardedCatalogService(catalog, FormatFactory(), ExportStore(tmp_path))
+    for idx in range(40):
+        service.add_book(make_payload(f"isbn-{idx}"))
+
+    sizes = [len(shard.catalog.list_books()) for shard in catalog.shards]
+    assert sum(sizes) == 40
+    assert sum(1 for size in sizes if size) > 1
+    assert service.get_book("isbn-7")["isbn"] == "isbn-7"
+    assert service.stats()["total_books"] == 40
+
+
+def test_concurrent_writers_to_different_books(service: ShardedCatalogService) -> None:
+    def write(idx: int) -> None:
+        service.add_book(make_payload(f"isbn-{idx}"))
+        service.update_book(f"isbn-{idx}", make_payload(f"isbn-{idx}", title="Updated"))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(200)))
+
+    books = service.list_books()
+    assert len(books) == 200
+    assert {book["title"] for book in books} == {"Updated"}
+    assert service.version == 400
+
+
+def test_undo_follows_global_order_across_shards(service: ShardedCatalogService) -> None:
+    service.add_book(make_payload("isbn-1"))
+    service.add_book(make_payload("isbn-2"))
+    service.update_book("isbn-1", make_payload("isbn-1", title="Changed"))
+
+    assert service.undo()["changed_isbns"] == ["isbn-1"]
+    assert service.get_book("isbn-1")["title"] == "Title"
+    assert service.undo()["changed_isbns"] == ["isbn-2"]
+    assert service.undo()["changed_isbns"] == ["isbn-1"]
+    with pytest.raises(ValueError):
+        service.undo()
+
+
+def test_failed_write_is_not_recorded_for_undo(service: ShardedCatalogService) -> None:
+    service.add_book(make_payload("isbn-1"))
+    with pytest.raises(ValueError):
+        service.add_book(make_payload("isbn-1"))
+
+    summary = service.undo()
+
+    assert summary["changed_isbns"] == ["isbn-1"]
+    assert summary["remaining_undos"] == 0
+
+
+def test_import_replaces_every_shard_as_one_undo_step(service: ShardedCatalogService) -> None:
+    service.add_book(make_payload("isbn-old"))
+    content = service.export_catalog("json").replace("isbn-old", "isbn-new")
+
+    assert service.import_catalog(content, "json")["count"] == 1
+    assert [book["isbn"] for book in service.list_books()] == ["isbn-new"]
+
+    service.undo()
+    assert [book["isbn"] for book in service.list_books()] == ["isbn-old"]
+
+
+def test_snapshot_is_split_across_shards(service: ShardedCatalogService, tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    write_snapshot(path, [Book(**make_payload(f"isbn-{idx}")) for idx in range(20)])
+
+    assert service.load_snapshot(path) == 20
+
+    assert len(service.list_books()) == 20
+    assert service.lookup_books(["isbn-3", "missing", "isbn-19"]) == {
+        "books": [make_payload("isbn-3"), make_payload("isbn-19")],
+        "missing": ["missing"],
+    }
+
+
+def test_rejects_empty_shard_count() -> None:
+    with pytest.raises(ValueError):
+        ShardedCatalog(0)
+
+
+def test_sharded_service_shares_the_base_without_single_catalog_state(service: ShardedCatalogService) -> None:
+    assert isinstance(service, BaseCatalogService)
+    assert not isinstance(service, CatalogService)
+    assert not hasattr(service, "_catalog")
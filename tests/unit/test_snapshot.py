@@ -0,0 +1,93 @@
+"""Tests for memory-mapped snapshots and lazily loaded catalogs."""
+
+from pathlib import Path
+
+import pytest
+
+from app.domain.book import Book
+from app.domain.catalog import Catalog
+from app.domain.stats import CatalogStats
+from app.domain.undo_manager import UndoManager
+from app.infrastructure.snapshot import MappedSnapshot, write_snapshot
+
+
+def make_books(count: int = 5) -> list[Book]:
+    books = [
+        Book(title=f"Title {idx}", author="Author", isbn=f"isbn-{idx}", publisher="Press", pages=100 + idx)
+        for idx in range(count)
+    ]
+    books.append(Book(title="Ação & <XML>", author="Autor", isbn="978-0-13-110362-7", publisher="P", pages=9))
+    return books
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    books = make_books()
+    path = tmp_path / "catalog.snap"
+
+    assert write_snapshot(path, books) == len(books)
+    snapshot = MappedSnapshot(path)
+
+    assert len(snapshot) == len(books)
+    assert snapshot.keys()[-1] == 9780131103627
+    assert [snapshot.load(idx) for idx in range(len(books))] == books
+    with pytest.raises(IndexError):
+        snapshot.load(len(books))
+    snapshot.close()
+
+
+def test_snapshot_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    path.write_text('{"catalog": []}')
+
+    with pytest.raises(ValueError):
+        MappedSnapshot(path)
+
+
+def test_catalog_materializes_books_on_access(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    write_snapshot(path, make_books())
+    catalog = Catalog()
+
+    catalog.load_source(MappedSnapshot(path))
+
+    assert catalog._books.materialized == 0
+    assert catalog.get_book("0131103628").title == "Ação & <XML>"
+    assert catalog._books.materialized == 1
+    assert len(catalog.list_books()) == 6
+    assert catalog.stats.total_books == 6
+
+
+def test_undo_on_lazy_catalog_only_decodes_changed_books(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    write_snapshot(path, make_books(50))
+    catalog = Catalog()
+    catalog.load_source(MappedSnapshot(path))
+    undo = UndoManager()
+
+    undo.record_state(catalog.create_memento())
+    catalog.update_book("isbn-3", Book(title="Changed", author="A", isbn="isbn-3", publisher="P", pages=1))
+    undo.record_state(catalog.create_memento())
+    catalog.remove_book("isbn-4")
+
+    assert undo.undo(catalog) == ["isbn-4"]
+    assert undo.undo(catalog) == ["isbn-3"]
+    assert catalog.get_book("isbn-3").title == "Title 3"
+    assert catalog._books.materialized <= 3
+
+
+def test_undo_on_lazy_catalog_keeps_stats_current(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.snap"
+    write_snapshot(path, make_books(50))
+    catalog = Catalog()
+    catalog.load_source(MappedSnapshot(path))
+    undo = UndoManager()
+    undo.record_state(catalog.create_memento())
+    catalog.update_book("isbn-3", Book(title="Changed", author="B", isbn="isbn-3", publisher="Q", pages=1))
+    stats = catalog.stats
+
+    undo.undo(catalog)
+
+    assert catalog.stats is stats
+    expected = CatalogStats(catalog.list_books())
+    for group in ("publisher", "author", "pages"):
+        assert stats.to_dict(group_by=group) == expected.to_dict(group_by=group)
@@ -2,11 +2,18 @@
 
 import json
 import xml.etree.ElementTree as ET
+from types import SimpleNamespace
 
 import pytest
 
+from app.domain.book import Book
+from app.domain.validation import MalformedRecord
+from app.infrastructure.factories import format_factory
 from app.infrastructure.factories.format_factory import FormatFactory
+from app.infrastructure.formats.base import FormatCapabilities, LineFormatStrategy
+from app.infrastructure.formats.csv_format import CsvFormatStrategy
 from app.infrastructure.formats.json_format import JsonFormatStrategy
+from app.infrastructure.formats.ndjson_format import NdjsonFormatStrategy
 from app.infrastructure.formats.xml_format import XmlFormatStrategy
 
 SAMPLE = [
@@ -32,20 +39,119 @@ def test_xml_strategy_round_trip() -> None:
     assert SAMPLE == strategy.deserialize(serialized)
 
 
+def test_xml_strategy_matches_element_tree_output() -> None:
+    books = [{**SAMPLE[0], "title": "Tom & Jerry <Vol. 1>"}]
+    root = ET.Element("catalog")
+    for book in books:
+        book_el = ET.SubElement(root, "book")
+        for key, value in book.items():
+            ET.SubElement(book_el, key).text = str(value)
+
+    strategy = XmlFormatStrategy()
+
+    assert strategy.serialize(books) == ET.tostring(root, encoding="unicode")
+    assert strategy.serialize([]) == "<catalog />"
+    assert strategy.deserialize(strategy.serialize(books)) == books
+
+
+def test_xml_strategy_parses_across_chunks() -> None:
+    books = [{**SAMPLE[0], "isbn": str(idx), "title": "T" * 500} for idx in range(500)]
+    strategy = XmlFormatStrategy()
+
+    assert strategy.deserialize(strategy.serialize(books)) == books
+
+
+def test_json_strategy_compact_mode() -> None:
+    strategy = JsonFormatStrategy(compact=True)
+    serialized = strategy.serialize(SAMPLE)
+
+    assert "\n" not in serialized
+    assert SAMPLE == strategy.deserialize(serialized)
+
+
+def test_json_strategy_decodes_books_directly() -> None:
+    strategy = JsonFormatStrategy()
+    serialized = strategy.serialize([{**SAMPLE[0], "pages": "50"}])
+
+    assert strategy.deserialize_books(serialized) == [Book.from_dict(SAMPLE[0])]
+    assert strategy.deserialize_books("") == []
+
+
+@pytest.mark.parametrize("strategy", [CsvFormatStrategy(), NdjsonFormatStrategy()])
+def test_line_strategies_round_trip(strategy: LineFormatStrategy) -> None:
+    books = [{**SAMPLE[0], "title": 'Quotes "and", commas'}, {**SAMPLE[0], "isbn": "456"}]
+    serialized = strategy.serialize(books)
+
+    assert serialized.count("\n") == len(books) + (strategy.header is not None)
+    assert books == strategy.deserialize(serialized)
+
+
+@pytest.mark.parametrize("strategy", [CsvFormatStrategy(), NdjsonFormatStrategy()])
+def test_line_strategies_keep_unicode_line_separators(strategy: LineFormatStrategy) -> None:
+    title = "A\u2028B\x85C\x0bD\x0cE\x1cF\x1dG\x1eH"
+    books = [{**SAMPLE[0], "title": title}, {**SAMPLE[0], "isbn": "456"}]
+
+    assert strategy.deserialize(strategy.serialize(books)) == books
+
+
+@pytest.mark.parametrize("strategy", [CsvFormatStrategy(), NdjsonFormatStrategy()])
+def test_line_strategies_decode_split_chunks(strategy: LineFormatStrategy) -> None:
+    books = [{**SAMPLE[0], "isbn": str(idx)} for idx in range(6)]
+    lines = list(strategy.iter_serialize(books))
+    first, second = lines[:3], lines[3:]
+
+    decoded = list(strategy.iter_deserialize(first)) + list(strategy.iter_deserialize(second))
+
+    assert decoded == books
+
+
+def test_csv_strategy_rejects_line_breaks_and_bad_rows() -> None:
+    strategy = CsvFormatStrategy()
+
+    with pytest.raises(ValueError):
+        strategy.serialize([{**SAMPLE[0], "title": "two\nlines"}])
+
+    with pytest.raises(ValueError):
+        strategy.deserialize("only,three,columns\n")
+
+
+@pytest.mark.parametrize("strategy", [CsvFormatStrategy(), NdjsonFormatStrategy()])
+def test_line_strategies_lenient_decoding_marks_bad_lines(strategy: LineFormatStrategy) -> None:
+    good = strategy.encode_record(SAMPLE[0])
+    lines = [good, "not,a valid record{", good]
+
+    with pytest.raises(ValueError):
+        list(strategy.iter_deserialize(lines))
+
+    decoded = list(strategy.iter_deserialize(lines, lenient=True))
+    assert decoded[0] == decoded[2] == SAMPLE[0]
+    assert isinstance(decoded[1], MalformedRecord)
+
+
 def test_json_strategy_invalid_input() -> None:
     strategy = JsonFormatStrategy()
 
     with pytest.raises(json.JSONDecodeError):
         strategy.deserialize("{invalid}")
 
+    with pytest.raises(json.JSONDecodeError):
+        strategy.deserialize_books("{invalid}")
+
+    for content in ('[{"isbn": "1"}]', '"text"', '{"catalog": {"isbn": "1"}}'):
+        with pytest.raises(ValueError):
+            strategy.deserialize(content)
+
 
 
 def test_xml_strategy_invalid_input() -> None:
     strategy = XmlFormatStrategy()
 
-    with pytest.raises(ET.ParseError):
+    with pytest.raises(ValueError):
         strategy.deserialize("<catalog><book></catalog>")
 
+    with pytest.raises(ValueError):
+        strategy.deserialize("<catalog><book><title>Cut")
+
 
 
 def test_format_factory_unsupported_format() -> None:
@@ -53,3 +159,42 @@ def test_format_factory_unsupported_format() -> None:
 
     with pytest.raises(ValueError):
         factory.create("yaml")
+
+
+def test_format_factory_caches_strategy_instances() -> None:
+    factory = FormatFactory()
+
+    assert factory.create("json") is factory.create("JSON")
+    assert factory.capabilities("ndjson") == FormatCapabilities(streaming=True)
+    assert factory.capabilities("xml").streaming is False
+
+
+def test_format_factory_registers_plugins(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(FormatFactory, "_strategies", dict(FormatFactory._strategies))
+    plugin = SimpleNamespace(name="TSV", load=lambda: CsvFormatStrategy)
+    monkeypatch.setattr(format_factory, "entry_points", lambda group: [plugin])
+    factory = FormatFactory()
+
+    assert FormatFactory.load_entry_points() == ["tsv"]
+    first = factory.create("tsv")
+    assert isinstance(first, CsvFormatStrategy)
+    assert "tsv" in factory.formats()
+
+    FormatFactory.register("tsv", NdjsonFormatStrategy)
+    assert isinstance(factory.create("tsv"), NdjsonFormatStrategy)
+
+
+def test_format_factory_skips_broken_plugins(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(FormatFactory, "_strategies", dict(FormatFactory._strategies))
+
+    def broken() -> None:
+        raise ImportError("missing dependency")
+
+    plugins = [SimpleNamespace(name="broken", load=broken), SimpleNamespace(name="tsv", load=lambda: CsvFormatStrategy)]
+    monkeypatch.setattr(format_factory, "entry_points", lambda group: plugins)
+
+    assert FormatFactory.load_entry_points() == ["tsv"]
+    assert "broken" not in FormatFactory().formats()
+    assert "broken" in caplog.text
@@ -0,0 +1,88 @@
+"""Tests for ISBN rules and the import validation pipeline."""
+
+from app.domain import isbn
+from app.domain.book import Book
+from app.domain.validation import ImportValidator
+
+
+def record(isbn_value: str = "9780131103627", **overrides: object) -> dict:
+    return {"title": "T", "author": "A", "isbn": isbn_value, "publisher": "P", "pages": 10, **overrides}
+
+
+def test_isbn_checksums() -> None:
+    assert isbn.is_valid("978-0-13-110362-7")
+    assert isbn.is_valid("0-13-110362-8")
+    assert isbn.is_valid("080442957x")
+    assert not isbn.is_valid("9780131103628")
+    assert not isbn.is_valid("001")
+
+
+def test_validator_accepts_clean_records() -> None:
+    report = ImportValidator().validate([record(), record("080442957X", pages="12")])
+
+    assert report.valid
+    assert [book.pages for book in report.books] == [10, 12]
+
+
+def test_isbn_normalization() -> None:
+    assert isbn.to_isbn13("0-13-110362-8") == "9780131103627"
+    assert isbn.to_isbn13("978 0 13 110362 7") == "9780131103627"
+    assert isbn.to_isbn13("5555555555555") is None
+    assert isbn.catalog_key("0131103628") == isbn.catalog_key("978-0-13-110362-7") == 9780131103627
+    assert isbn.catalog_key("001") == "001"
+
+
+def test_validator_flags_equivalent_isbns_as_duplicates() -> None:
+    report = ImportValidator().validate([record(), record("0-13-110362-8")])
+
+    assert report.errors[0].message == "duplicates record 0"
+
+
+def test_validator_collects_every_error() -> None:
+    records = [
+        record(),
+        {"title": "", "author": "A", "isbn": "1", "publisher": "P"},
+        record(pages=0),
+        record(),
+        "not a record",
+    ]
+
+    report = ImportValidator().validate(records)
+
+    assert report.invalid_count == 4
+    assert [book.isbn for book in report.books] == ["9780131103627"]
+    assert {(error.index, error.field) for error in report.errors} == {
+        (1, "title"),
+        (1, "pages"),
+        (2, "isbn"),
+        (2, "pages"),
+        (3, "isbn"),
+        (4, None),
+    }
+
+
+def test_validator_checksum_is_opt_in() -> None:
+    records = [record("5555555555555")]
+
+    assert ImportValidator().validate(records).valid
+    report = ImportValidator(verify_isbn_checksum=True).validate(records)
+    assert report.errors[0].message == "is not a valid ISBN-10/13"
+
+
+def test_validate_books_reuses_typed_books() -> None:
+    books = [Book.from_dict(record()), Book.from_dict(record(pages=-1))]
+
+    report = ImportValidator().validate_books(books)
+
+    assert report.books == [books[0]]
+    assert report.errors[0].index == 1
+
+
+def test_validator_reports_progress_in_steps() -> None:
+    books = [Book.from_dict(record(str(idx))) for idx in range(2500)]
+    steps: list = []
+
+    report = ImportValidator().validate_books(books, progress=steps.append)
+
+    assert steps == [1024, 1024, 452]
+    assert len(report.books) == 2500